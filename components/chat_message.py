@@ -5,18 +5,44 @@ import streamlit as st
 
 from components.insight_card import source_card_html
 
+# Messages rendered inline; older history is only drawn on request
+RECENT_MESSAGE_COUNT = 20
+
 
 def render_chat_messages(messages: list[dict]) -> None:
-    """Render all chat messages with source cards."""
-    for message in messages:
-        with st.chat_message(message["role"]):
-            st.markdown(message["content"])
-
-            sources = message.get("sources")
-            if sources:
-                # Render inline source cards instead of expanders
-                cards_html = "".join(source_card_html(s) for s in sources)
-                st.markdown(
-                    f'<div style="margin-top:8px">{cards_html}</div>',
-                    unsafe_allow_html=True,
-                )
+    """Render chat messages with source cards.
+
+    Only the most recent RECENT_MESSAGE_COUNT messages are rendered by
+    default, so a rerun costs the same however long the conversation gets.
+    Earlier history stays unrendered until "Show earlier messages" is
+    clicked (remembered for the conversation), then drawn the same way,
+    source cards included.
+    """
+    earlier = messages[:-RECENT_MESSAGE_COUNT]
+    if earlier:
+        show_earlier = st.session_state.get("show_earlier_messages") or st.button(
+            f"Show earlier messages ({len(earlier)})",
+            key="show_earlier_messages_btn",
+        )
+        if show_earlier:
+            st.session_state.show_earlier_messages = True
+            for message in earlier:
+                _render_message(message)
+
+    for message in messages[-RECENT_MESSAGE_COUNT:]:
+        _render_message(message)
+
+
+def _render_message(message: dict) -> None:
+    """Render a single chat message with its source cards."""
+    with st.chat_message(message["role"]):
+        st.markdown(message["content"])
+
+        sources = message.get("sources")
+        if sources:
+            # Render inline source cards instead of expanders
+            cards_html = "".join(source_card_html(s) for s in sources)
+            st.markdown(
+                f'<div style="margin-top:8px">{cards_html}</div>',
+                unsafe_allow_html=True,
+            )
@@ -4,6 +4,7 @@ Used on the Experts page grid and in @st.dialog profile modals.
 """
 from __future__ import annotations
 
+from string import Template
 from typing import Optional
 
 from utils.data import (
@@ -15,6 +16,16 @@ from utils.data import (
     load_insights,
 )
 
+# Grid card template, compiled once at import
+_EXPERT_CARD_TPL = Template("""<div class="expert-card">
+    <img src="$avatar_src" class="avatar" alt="$name">
+    <p class="name">$name</p>
+    $confidence_html
+    <p class="specialty">$specialty</p>
+    <div class="meta">$meta_html</div>
+    $frameworks_html
+</div>""")
+
 
 def expert_card_html(
     slug: str,
@@ -58,14 +69,14 @@ def expert_card_html(
         meta_parts.append(f'{followers_str} followers')
     meta_html = " &middot; ".join(meta_parts)
 
-    return f"""<div class="expert-card">
-    <img src="{avatar_src}" class="avatar" alt="{name}">
-    <p class="name">{name}</p>
-    {confidence_html}
-    <p class="specialty">{specialty}</p>
-    <div class="meta">{meta_html}</div>
-    {frameworks_html}
-</div>"""
+    return _EXPERT_CARD_TPL.substitute(
+        avatar_src=avatar_src,
+        name=name,
+        confidence_html=confidence_html,
+        specialty=specialty,
+        meta_html=meta_html,
+        frameworks_html=frameworks_html,
+    )
 
 
 def expert_profile_html(
@@ -4,8 +4,34 @@ Used on the Insights page and as source cards in chat responses.
 """
 from __future__ import annotations
 
+from string import Template
+
 from utils.data import get_avatar_base64, get_methodology_color, get_stage_color
 
+# Card templates are compiled once at import; renders only call substitute()
+_CARD_HEADER_TPL = Template("""<div class="card-header">
+    <img src="$avatar_src" alt="$name">
+    <span class="expert-name">$name</span>
+    <span class="stage-badge $stage_color">$stage</span>
+</div>""")
+
+_INSIGHT_CARD_TPL = Template("""<div class="insight-card">
+    $header_html
+    $insight_html
+    $steps_html
+    $quote_html
+    $tags_html
+</div>""")
+
+_SOURCE_CARD_TPL = Template("""<div class="source-card"$link_attr>
+    <img src="$avatar_src" alt="$name">
+    <div class="source-info">
+        <div class="source-name">$name</div>
+        <div class="source-stage">$stage</div>
+        $quote_html
+    </div>
+</div>""")
+
 
 def insight_card_html(insight: dict, show_expert: bool = True) -> str:
     """Render a full insight card as HTML.
@@ -27,12 +53,12 @@ def insight_card_html(insight: dict, show_expert: bool = True) -> str:
     if show_expert:
         avatar_b64 = get_avatar_base64(slug)
         avatar_src = f"data:image/png;base64,{avatar_b64}" if avatar_b64 else ""
-        stage_color = get_stage_color(stage)
-        header_html = f"""<div class="card-header">
-    <img src="{avatar_src}" alt="{name}">
-    <span class="expert-name">{name}</span>
-    <span class="stage-badge {stage_color}">{stage}</span>
-</div>"""
+        header_html = _CARD_HEADER_TPL.substitute(
+            avatar_src=avatar_src,
+            name=name,
+            stage_color=get_stage_color(stage),
+            stage=stage,
+        )
 
     # Key insight
     insight_html = f'<p class="key-insight">{key_insight}</p>' if key_insight else ""
@@ -65,13 +91,13 @@ def insight_card_html(insight: dict, show_expert: bool = True) -> str:
     if tag_items:
         tags_html = f'<div class="tags">{"".join(tag_items)}</div>'
 
-    return f"""<div class="insight-card">
-    {header_html}
-    {insight_html}
-    {steps_html}
-    {quote_html}
-    {tags_html}
-</div>"""
+    return _INSIGHT_CARD_TPL.substitute(
+        header_html=header_html,
+        insight_html=insight_html,
+        steps_html=steps_html,
+        quote_html=quote_html,
+        tags_html=tags_html,
+    )
 
 
 def source_card_html(insight: dict) -> str:
@@ -95,14 +121,13 @@ def source_card_html(insight: dict) -> str:
 
     link_attr = f' onclick="window.open(\'{source_url}\', \'_blank\')" style="cursor:pointer"' if source_url else ""
 
-    return f"""<div class="source-card"{link_attr}>
-    <img src="{avatar_src}" alt="{name}">
-    <div class="source-info">
-        <div class="source-name">{name}</div>
-        <div class="source-stage">{stage}</div>
-        {quote_html}
-    </div>
-</div>"""
+    return _SOURCE_CARD_TPL.substitute(
+        link_attr=link_attr,
+        avatar_src=avatar_src,
+        name=name,
+        stage=stage,
+        quote_html=quote_html,
+    )
 
 
 def methodology_tag_html(tag: dict) -> str:
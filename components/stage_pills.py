@@ -10,17 +10,23 @@ def stage_badge_html(stage: str) -> str:
     return f'<span class="stage-badge {color_cls}">{stage}</span>'
 
 
+# Stage filter entries in display order: (internal value, label, counts key).
+# Static, so only the count suffixes are formatted per rerun.
+_STAGE_OPTIONS = [
+    ("All", "All stages", "All"),
+    *[(group_name, group_name, group_name) for group_name in STAGE_GROUPS],
+    ("General Sales Mindset", "Mindset", "Mindset"),
+]
+_LABEL_TO_VALUE = {label: value for value, label, _ in _STAGE_OPTIONS}
+_VALUE_TO_POSITION = {value: i for i, (value, _, _) in enumerate(_STAGE_OPTIONS)}
+
+
 def stage_group_options(counts: dict[str, int]) -> list[str]:
     """Build display options for the stage filter with counts.
 
     Returns list like: ["All stages (1893)", "Planning & Research (234)", ...]
     """
-    options = [f"All stages ({counts.get('All', 0)})"]
-    for group_name in STAGE_GROUPS:
-        count = counts.get(group_name, 0)
-        options.append(f"{group_name} ({count})")
-    options.append(f"Mindset ({counts.get('Mindset', 0)})")
-    return options
+    return [f"{label} ({counts.get(key, 0)})" for _, label, key in _STAGE_OPTIONS]
 
 
 def stage_option_to_value(option: str) -> str:
@@ -30,24 +36,12 @@ def stage_option_to_value(option: str) -> str:
     'All stages (1893)' -> 'All'
     'Mindset (45)' -> 'General Sales Mindset'
     """
-    if option.startswith("All stages"):
-        return "All"
-    if option.startswith("Mindset"):
-        return "General Sales Mindset"
     # Strip the count suffix: 'Planning & Research (234)' -> 'Planning & Research'
     paren_idx = option.rfind(" (")
-    if paren_idx > 0:
-        return option[:paren_idx]
-    return option
+    label = option[:paren_idx] if paren_idx > 0 else option
+    return _LABEL_TO_VALUE.get(label, label)
 
 
 def value_to_stage_option(value: str, options: list[str]) -> str:
-    """Find the display option for an internal value."""
-    if value == "All":
-        return options[0]
-    if value == "General Sales Mindset":
-        return options[-1]
-    for opt in options:
-        if opt.startswith(value):
-            return opt
-    return options[0]
+    """Find the display option for an internal value (options[0] if unknown)."""
+    return options[_VALUE_TO_POSITION.get(value, 0)]
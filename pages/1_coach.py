@@ -6,9 +6,12 @@ from 48 experts with inline source cards. Supports persona mode
 """
 from __future__ import annotations
 
+import threading
+from string import Template
 from typing import Optional
 
 import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 
 from components.chat_message import render_chat_messages
 from components.insight_card import source_card_html
@@ -20,92 +23,122 @@ from components.stage_pills import (
 from utils.ai import (
     generate_conversation_title,
     get_anthropic_key,
-    get_coaching_advice,
-    synthesize_stage_insight,
+    stream_coaching_advice,
+    synthesize_stage_insights,
 )
 from utils.data import (
-    filter_insights,
     get_avatar_base64,
     get_confidence_label,
     get_influencer_details,
     get_influencer_name,
-    get_stage_counts,
+    load_filtered_insights,
+    load_influencer_count,
     load_influencers,
-    load_insights,
     load_methodologies,
     load_personas,
+    load_stage_counts,
+    load_stage_groups,
     get_persona,
 )
 from utils.search import build_context, find_relevant_insights
-from utils.state import reset_conversation, switch_persona, sync_query_params, update_query_params
+from utils.state import (
+    reset_conversation,
+    switch_persona,
+    sync_query_params,
+    update_query_params,
+)
+
+# Persona banner template, compiled once; each rerun only substitutes values
+_COACHING_MODE_TPL = Template("""<div class="coaching-mode">
+    <img src="data:image/png;base64,$avatar_b64" alt="$name">
+    <div>
+        <span class="label">Coaching as $name</span><br>
+        $sublabel
+    </div>
+</div>""")
 
 
 # ── Header ─────────────────────────────────────────────
 
+# Static page header; selection-dependent UI is rendered separately below it
+_HEADER_HTML = """<div class="header-container">
+    <div class="header-title"><h1>Sales Coach AI</h1></div>
+    <p class="header-subtitle">Expert coaching from 48 sales leaders</p>
+</div>"""
+
+
 def _render_header() -> None:
     """Render the coach page header with title."""
-    st.markdown(
-        """<div class="header-container">
-            <div class="header-title"><h1>Sales Coach AI</h1></div>
-            <p class="header-subtitle">Expert coaching from 48 sales leaders</p>
-        </div>""",
-        unsafe_allow_html=True,
-    )
+    st.markdown(_HEADER_HTML, unsafe_allow_html=True)
 
 
 # ── Expert Selection (popover + featured row) ──────────
 
-def _render_expert_selector() -> None:
-    """Render the expert selector: featured avatars + searchable popover."""
-    influencers = load_influencers()
-    selected = st.session_state.get("selected_persona")
+# Highlight for the selected featured avatar (collective wisdom when none)
+_SELECTED_FEATURED_CSS = Template(
+    '.featured-expert[data-slug="$slug"] img '
+    "{border-color: var(--gold-primary); box-shadow: var(--shadow-glow);}"
+)
 
-    # Featured experts row (top 6 by followers + collective wisdom)
+
+@st.cache_resource(ttl=600)
+def _featured_experts() -> list[tuple[Optional[str], str]]:
+    """(slug, label) for collective wisdom plus the top 6 experts by followers."""
     sorted_by_followers = sorted(
-        influencers, key=lambda x: x.get("followers") or 0, reverse=True
+        load_influencers(), key=lambda x: x.get("followers") or 0, reverse=True
     )
-    featured = sorted_by_followers[:6]
+    return [(None, "All")] + [
+        (inf["slug"], inf["name"].split()[0]) for inf in sorted_by_followers[:6]
+    ]
 
-    # Build featured row HTML
-    featured_html_parts = []
 
-    # Collective wisdom first
-    cw_b64 = get_avatar_base64("collective-wisdom")
-    cw_selected = "selected" if selected is None else ""
-    featured_html_parts.append(
-        f'<div class="featured-expert {cw_selected}">'
-        f'<img src="data:image/png;base64,{cw_b64}">'
-        f'<span class="name">All</span></div>'
-    )
+@st.cache_resource(ttl=600)
+def _featured_strip_html() -> str:
+    """Featured experts row (see _featured_experts) as HTML.
 
-    for inf in featured:
-        b64 = get_avatar_base64(inf["slug"])
-        is_sel = "selected" if selected == inf["slug"] else ""
-        first_name = inf["name"].split()[0]
+    Built without any selection state so one copy serves every rerun; the
+    selected avatar is highlighted by a separate per-rerun style rule.
+    """
+    featured_html_parts = []
+    for slug, label in _featured_experts():
+        avatar_slug = slug or "collective-wisdom"
+        b64 = get_avatar_base64(avatar_slug)
+        title = f' title="{get_influencer_name(slug)}"' if slug else ""
         featured_html_parts.append(
-            f'<div class="featured-expert {is_sel}">'
-            f'<img src="data:image/png;base64,{b64}" title="{inf["name"]}">'
-            f'<span class="name">{first_name}</span></div>'
+            f'<div class="featured-expert" data-slug="{avatar_slug}">'
+            f'<img src="data:image/png;base64,{b64}"{title}>'
+            f'<span class="name">{label}</span></div>'
         )
 
+    return f'<div class="featured-experts">{"".join(featured_html_parts)}</div>'
+
+
+@st.fragment
+def _render_expert_selector() -> None:
+    """Render the expert selector: featured avatars + searchable popover.
+
+    Runs as a fragment so typing in the expert search only reruns the
+    selector. Picking an expert still triggers a full-app rerun, since the
+    persona changes the rest of the page; it's a server-side rerun, so the
+    session and its connection are kept (no page reload).
+    """
+    influencers = load_influencers()
+    selected = st.session_state.get("selected_persona") or "collective-wisdom"
+
+    # Strip is cached; only the highlight rule for the selection changes
     st.markdown(
-        f'<div class="featured-experts">{"".join(featured_html_parts)}</div>',
+        f"<style>{_SELECTED_FEATURED_CSS.substitute(slug=selected)}</style>"
+        f"{_featured_strip_html()}",
         unsafe_allow_html=True,
     )
 
     # Selection buttons (Streamlit needs real buttons for state)
-    # Collective wisdom + featured experts in a row
-    button_items = [{"slug": None, "label": "All"}] + [
-        {"slug": inf["slug"], "label": inf["name"].split()[0]}
-        for inf in featured
-    ]
-
-    cols = st.columns(len(button_items))
-    for i, item in enumerate(button_items):
-        with cols[i]:
-            key = "select_cw" if item["slug"] is None else f"sel_{item['slug']}"
-            if st.button(item["label"], key=key, use_container_width=True):
-                switch_persona(item["slug"])
+    featured = _featured_experts()
+    for col, (slug, label) in zip(st.columns(len(featured)), featured):
+        with col:
+            key = "select_cw" if slug is None else f"sel_{slug}"
+            if st.button(label, key=key, use_container_width=True):
+                switch_persona(slug)
                 st.rerun()
 
     # "Browse all experts" popover
@@ -191,41 +224,50 @@ def _render_coaching_mode() -> None:
         sublabel = f'<span class="sublabel">{label} profile</span>'
 
     st.markdown(
-        f"""<div class="coaching-mode">
-    <img src="data:image/png;base64,{b64}" alt="{name}">
-    <div>
-        <span class="label">Coaching as {name}</span><br>
-        {sublabel}
-    </div>
-</div>""",
+        _COACHING_MODE_TPL.substitute(avatar_b64=b64, name=name, sublabel=sublabel),
         unsafe_allow_html=True,
     )
 
 
 # ── Filters (stage + methodology) ─────────────────────
 
-@st.fragment
-def _render_filters(insights: list[dict]) -> None:
-    """Render stage and methodology filters."""
+def _on_stage_change() -> None:
+    """Copy the stage filter choice into session state before the rerun."""
+    st.session_state.selected_stage_group = stage_option_to_value(
+        st.session_state.coach_stage_filter
+    )
+
+
+def _on_methodology_change(ids_by_name: dict[str, str]) -> None:
+    """Copy the methodology filter choice into session state before the rerun."""
+    # "All methodologies" isn't in the mapping, so it clears the filter
+    st.session_state.selected_methodology = ids_by_name.get(
+        st.session_state.coach_method_filter
+    )
+
+
+def _render_filters() -> None:
+    """Render stage and methodology filters.
+
+    Changes are applied by on_change callbacks, which run before the
+    widget's own rerun, so a filter change costs one script run.
+    """
     col1, col2 = st.columns(2)
 
     with col1:
-        counts = get_stage_counts(insights)
+        counts = load_stage_counts()
         options = stage_group_options(counts)
         current = st.session_state.get("selected_stage_group", "All")
         current_display = value_to_stage_option(current, options)
 
-        selected = st.selectbox(
+        st.selectbox(
             "Deal stage",
             options=options,
             index=options.index(current_display) if current_display in options else 0,
             key="coach_stage_filter",
             label_visibility="collapsed",
+            on_change=_on_stage_change,
         )
-        new_value = stage_option_to_value(selected)
-        if new_value != current:
-            st.session_state.selected_stage_group = new_value
-            st.rerun()
 
     with col2:
         methodologies = load_methodologies()
@@ -239,44 +281,47 @@ def _render_filters(insights: list[dict]) -> None:
                         current_idx = i + 1
                         break
 
-            selected_method = st.selectbox(
+            st.selectbox(
                 "Methodology",
                 options=method_options,
                 index=current_idx,
                 key="coach_method_filter",
                 label_visibility="collapsed",
+                on_change=_on_methodology_change,
+                args=({m["name"]: m["id"] for m in methodologies},),
             )
-            if selected_method == "All methodologies":
-                if st.session_state.get("selected_methodology"):
-                    st.session_state.selected_methodology = None
-                    st.rerun()
-            else:
-                for m in methodologies:
-                    if m["name"] == selected_method:
-                        if st.session_state.get("selected_methodology") != m["id"]:
-                            st.session_state.selected_methodology = m["id"]
-                            st.rerun()
-                        break
 
 
 # ── Stage Summary ─────────────────────────────────────
 
-def _render_stage_summary(stage_group: str, insights: list[dict]) -> None:
+def _render_stage_summary(
+    stage_group: str,
+    expert_slug: Optional[str],
+    methodology_id: Optional[str],
+    insights: list[dict],
+) -> None:
     """Show a golden insight for the active stage filter.
 
-    Calls Claude to synthesize a 12-word actionable tip, cached in session state.
+    Calls Claude to synthesize a 12-word actionable tip. Tips for every
+    stage group come from one batched call that returns them as a JSON
+    object, cached across sessions by the groups' prompt sections, so
+    switching stage filters afterwards, or another visitor with the same
+    filters, doesn't wait on Claude again.
+
+    Args:
+        stage_group: Active stage group ("All" hides the summary)
+        expert_slug: Active expert filter, if any
+        methodology_id: Active methodology filter, if any
+        insights: Insights filtered by expert/methodology but not by stage
     """
     if stage_group == "All":
         return
 
-    cache = st.session_state.get("stage_insights", {})
-
-    if stage_group not in cache:
-        tip = synthesize_stage_insight(stage_group, insights)
-        cache[stage_group] = tip
-        st.session_state.stage_insights = cache
-
-    tip = cache[stage_group]
+    by_group = load_stage_groups(expert_slug, methodology_id)
+    if stage_group not in by_group:
+        # Unknown group (e.g. from a stale link): summarize the unstaged set
+        by_group = {**by_group, stage_group: insights}
+    tip = synthesize_stage_insights(by_group)[stage_group]
     st.markdown(
         f'<div class="stage-summary">'
         f'<span class="stage-summary-label">{stage_group}</span>'
@@ -330,14 +375,17 @@ def _render_welcome_state() -> None:
 # ── Chat Processing ────────────────────────────────────
 
 def _process_message(prompt: str, insights: list[dict]) -> dict:
-    """Process a user message and return the assistant response dict."""
+    """Process a user message and return the assistant response dict.
+
+    The reply is written into the current container (an assistant chat
+    message) as Claude generates it, instead of appearing only after
+    completion.
+    """
     selected = st.session_state.get("selected_persona")
     persona = get_persona(selected) if selected else None
 
     # Find relevant insights
-    relevant = find_relevant_insights(
-        insights, prompt, expert_slug=selected,
-    )
+    relevant = find_relevant_insights(insights, prompt, expert_slug=selected)
 
     if not relevant:
         if selected:
@@ -345,20 +393,57 @@ def _process_message(prompt: str, insights: list[dict]) -> dict:
             response_text = f"I couldn't find specific insights from {name} matching your question. Try switching to 'All Experts' for broader advice."
         else:
             response_text = "I couldn't find specific insights matching your question. Try rephrasing or ask about: discovery, objections, closing, negotiation, or prospecting."
+        st.markdown(response_text)
         return {"role": "assistant", "content": response_text, "sources": []}
 
     context = build_context(relevant)
-    response_text = get_coaching_advice(
-        prompt,
-        context,
-        st.session_state.messages[:-1] if st.session_state.messages else [],
-        persona=persona,
-    )
+    # The transcript ends with the just-appended prompt; utils.ai skips it
+    # and walks back only as far as the history budget
+    response_text = st.write_stream(stream_coaching_advice(
+        prompt, context, st.session_state.messages, persona=persona,
+    ))
 
     sources = relevant[:5]
     return {"role": "assistant", "content": response_text, "sources": sources}
 
 
+def _process_user_turn(prompt: str, insights: list[dict]) -> None:
+    """Handle one user message: draw it, stream the reply, record both.
+
+    Shared by suggested (prefill) questions and the chat input. The first
+    message of a conversation is titled on a worker thread while the reply
+    streams, so it doesn't wait on a second Claude round trip. The worker
+    gets this script run's context, so its st.secrets read and cached
+    Claude call behave as they would on the script thread.
+    """
+    st.session_state.messages.append({"role": "user", "content": prompt})
+    is_first = len(st.session_state.messages) == 1
+
+    with st.chat_message("user"):
+        st.markdown(prompt)
+
+    with st.chat_message("assistant"):
+        if is_first:
+            titles: list[str] = []
+            worker = threading.Thread(
+                target=lambda: titles.append(generate_conversation_title(prompt)),
+            )
+            add_script_run_ctx(worker, get_script_run_ctx())
+            worker.start()
+            response = _process_message(prompt, insights)
+            worker.join()
+            if titles:
+                st.session_state.conversation_title = titles[0]
+        else:
+            response = _process_message(prompt, insights)
+
+    st.session_state.messages.append(response)
+    # Follow-ups are already drawn in place; only a new conversation
+    # needs a rerun to swap the welcome layout for title + filters
+    if is_first:
+        st.rerun()
+
+
 # ── Main ───────────────────────────────────────────────
 
 def main() -> None:
@@ -369,17 +454,25 @@ def main() -> None:
 
     has_api_key = bool(get_anthropic_key())
 
-    # Load and filter insights
-    all_insights = load_insights()
+    # Load and filter insights (cached per filter state)
+    all_insights = load_filtered_insights()
     if not all_insights and has_api_key:
         st.warning("No insights loaded. Check database or Airtable connection.")
 
-    # Apply filters
-    filtered = filter_insights(
-        all_insights,
-        expert_slug=st.session_state.get("selected_persona"),
-        stage_group=st.session_state.get("selected_stage_group", "All"),
-        methodology_id=st.session_state.get("selected_methodology"),
+    # Apply filters (stage last, so the stage summary can reuse the rest)
+    expert_slug = st.session_state.get("selected_persona")
+    methodology_id = st.session_state.get("selected_methodology")
+    stage_group = st.session_state.get("selected_stage_group", "All")
+    # No filters is the common case: reuse the lists already in hand
+    expert_filtered = (
+        load_filtered_insights(expert_slug, None, methodology_id)
+        if expert_slug or methodology_id
+        else all_insights
+    )
+    filtered = (
+        load_filtered_insights(expert_slug, stage_group, methodology_id)
+        if stage_group != "All"
+        else expert_filtered
     )
 
     # Sync URL params with current filter state
@@ -388,32 +481,20 @@ def main() -> None:
     # Context bar + coaching mode + stage summary
     _render_context_bar()
     _render_coaching_mode()
-    _render_stage_summary(
-        st.session_state.get("selected_stage_group", "All"),
-        filtered,
-    )
+    _render_stage_summary(stage_group, expert_slug, methodology_id, expert_filtered)
 
     # Stage/methodology filters (shown when conversation active)
     has_conversation = bool(st.session_state.get("messages"))
     if has_conversation:
-        _render_filters(all_insights)
+        _render_filters()
 
-    # Handle prefilled question
+    # Handle prefilled question (needs the API, so dropped in preview mode)
     prefill = st.session_state.pop("prefill_question", None)
+    if not has_api_key:
+        prefill = None
 
     if not st.session_state.messages and not prefill:
         _render_welcome_state()
-    elif prefill and has_api_key:
-        st.session_state.messages.append({"role": "user", "content": prefill})
-        try:
-            st.session_state.conversation_title = generate_conversation_title(prefill)
-        except Exception:
-            words = prefill.split()[:5]
-            st.session_state.conversation_title = " ".join(words) + "..."
-
-        response = _process_message(prefill, filtered)
-        st.session_state.messages.append(response)
-        st.rerun()
     elif st.session_state.messages:
         # Show conversation title
         st.markdown(
@@ -422,6 +503,9 @@ def main() -> None:
         )
         render_chat_messages(st.session_state.messages)
 
+    if prefill:
+        _process_user_turn(prefill, filtered)
+
     # API key warning (shown after UI, not blocking)
     if not has_api_key:
         st.info("Add ANTHROPIC_API_KEY to secrets to enable chat. UI preview mode active.")
@@ -437,24 +521,7 @@ def main() -> None:
         if not has_api_key:
             st.error("Chat requires ANTHROPIC_API_KEY. Please configure secrets.")
         else:
-            st.session_state.messages.append({"role": "user", "content": prompt})
-
-            with st.chat_message("user"):
-                st.markdown(prompt)
-
-            with st.chat_message("assistant"):
-                with st.spinner("Thinking..."):
-                    if len(st.session_state.messages) == 1:
-                        try:
-                            st.session_state.conversation_title = generate_conversation_title(prompt)
-                        except Exception:
-                            words = prompt.split()[:5]
-                            st.session_state.conversation_title = " ".join(words) + "..."
-
-                    response = _process_message(prompt, filtered)
-
-            st.session_state.messages.append(response)
-            st.rerun()
+            _process_user_turn(prompt, filtered)
 
     # Clear conversation button
     if st.session_state.messages:
@@ -465,11 +532,12 @@ def main() -> None:
                 st.rerun()
 
     # Footer
-    influencer_count = len(load_influencers())
+    influencer_count = load_influencer_count()
     st.markdown(
         f'<div class="footer-text">Powered by Claude AI · {len(all_insights)} insights from {influencer_count} experts</div>',
         unsafe_allow_html=True,
     )
 
 
-main()
+if __name__ == "__main__":
+    main()
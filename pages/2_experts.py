@@ -12,6 +12,7 @@ from utils.data import (
     format_followers,
     get_avatar_base64,
     get_confidence_label,
+    get_influencers_by_slug,
     get_insight_counts_by_expert,
     get_persona,
     load_influencers,
@@ -25,12 +26,7 @@ from utils.state import switch_persona
 @st.dialog("Expert Profile", width="large")
 def show_profile(slug: str) -> None:
     """Show a full expert profile in a modal dialog."""
-    influencers = load_influencers()
-    details = None
-    for inf in influencers:
-        if inf["slug"] == slug:
-            details = inf
-            break
+    details = get_influencers_by_slug().get(slug)
 
     if not details:
         st.error("Expert not found.")
@@ -189,4 +185,5 @@ def main() -> None:
     )
 
 
-main()
+if __name__ == "__main__":
+    main()
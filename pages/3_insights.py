@@ -21,8 +21,10 @@ from utils.data import (
     STAGE_GROUPS,
     filter_insights,
     get_influencer_name,
+    get_influencer_slugs_by_name,
     get_stage_counts,
-    load_influencers,
+    group_insights_by_stage,
+    load_influencer_count,
     load_insights,
     load_methodologies,
     search_insights_fts,
@@ -118,7 +120,6 @@ def _render_methodology_explorer() -> None:
 def _render_insights_browser() -> None:
     """Render the filterable, paginated insights browser."""
     insights = load_insights()
-    influencers = load_influencers()
 
     # Filters row
     col1, col2, col3 = st.columns([2, 1, 1])
@@ -171,43 +172,28 @@ def _render_insights_browser() -> None:
 
     tabs = st.tabs(tab_display)
 
+    # Expert/methodology/search filters are the same for every tab, so
+    # apply them once and bucket the result by stage group in one pass
+    expert_slug = get_influencer_slugs_by_name().get(selected_expert_name)
+
+    methodology_id = method_map.get(selected_method_name)
+
+    if search_query:
+        base = search_insights_fts(search_query, limit=100)
+    else:
+        base = insights
+    base = filter_insights(base, expert_slug=expert_slug, methodology_id=methodology_id)
+    by_group = group_insights_by_stage(base)
+
     for tab, tab_label in zip(tabs, tab_labels):
         with tab:
             # Determine stage group
             if tab_label == "All":
-                stage_group = "All"
+                filtered = list(base)
             elif tab_label == "Mindset":
-                stage_group = "General Sales Mindset"
-            else:
-                stage_group = tab_label
-
-            # Apply filters
-            # Expert slug from name
-            expert_slug = None
-            if selected_expert_name != "All experts":
-                for inf in influencers:
-                    if inf["name"] == selected_expert_name:
-                        expert_slug = inf["slug"]
-                        break
-
-            methodology_id = method_map.get(selected_method_name)
-
-            if search_query:
-                filtered = search_insights_fts(search_query, limit=100)
-                # Apply additional filters on FTS results
-                filtered = filter_insights(
-                    filtered,
-                    expert_slug=expert_slug,
-                    stage_group=stage_group,
-                    methodology_id=methodology_id,
-                )
+                filtered = by_group["General Sales Mindset"]
             else:
-                filtered = filter_insights(
-                    insights,
-                    expert_slug=expert_slug,
-                    stage_group=stage_group,
-                    methodology_id=methodology_id,
-                )
+                filtered = by_group[tab_label]
 
             # Sort
             sort_key = f"sort_{tab_label}"
@@ -295,7 +281,7 @@ def main() -> None:
 
     # Footer
     insights = load_insights()
-    influencer_count = len(load_influencers())
+    influencer_count = load_influencer_count()
     methodology_count = len(load_methodologies())
 
     footer_parts = [f"{len(insights)} insights", f"{influencer_count} experts"]
@@ -308,4 +294,5 @@ def main() -> None:
     )
 
 
-main()
+if __name__ == "__main__":
+    main()
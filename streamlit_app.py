@@ -5,6 +5,7 @@ Navigation via horizontal tabs in the header.
 """
 from __future__ import annotations
 
+import importlib
 from pathlib import Path
 
 import streamlit as st
@@ -18,24 +19,27 @@ st.set_page_config(
     layout="wide",
 )
 
-# Load CSS design system once
-css_path = Path(__file__).parent / "assets" / "style.css"
-if css_path.exists():
-    st.markdown(f"<style>{css_path.read_text()}</style>", unsafe_allow_html=True)
 
-# Initialize shared session state
-init_session_state()
+@st.cache_resource
+def _load_env() -> None:
+    """Load a local .env once per process, not on every rerun.
 
-# ── Tab Navigation (Horizontal) ────────────────────────────────────
+    It backs the env-var fallbacks used when Streamlit secrets aren't
+    configured. python-dotenv is optional.
+    """
+    try:
+        from dotenv import load_dotenv
+    except ImportError:
+        return
+    load_dotenv()
 
-# Get current tab from URL params or default to "coach"
-if "page" not in st.query_params:
-    st.query_params["page"] = "coach"
-current_tab = st.query_params.get("page", "coach")
 
-# Hide the default Streamlit sidebar and render horizontal tab navigation
-st.markdown("""
-<style>
+_load_env()
+
+CSS_PATH = Path(__file__).parent / "assets" / "style.css"
+
+# Hide the default Streamlit sidebar and style the horizontal tab navigation
+NAV_CSS = """
 /* Hide default Streamlit sidebar */
 [data-testid="stSidebar"] {
     display: none;
@@ -75,8 +79,32 @@ section[data-testid="stSidebar"] {
     margin-right: 0.5rem;
     font-size: 1.2rem;
 }
-</style>
-""", unsafe_allow_html=True)
+"""
+
+
+@st.cache_resource(max_entries=1)
+def _css_block(css_mtime: float) -> str:
+    """Design system + nav CSS as one <style> block.
+
+    Keyed on style.css's mtime, so the file is read once and again only
+    after it is edited.
+    """
+    css = CSS_PATH.read_text() if CSS_PATH.exists() else ""
+    return f"<style>{css}\n{NAV_CSS}</style>"
+
+
+_css_mtime = CSS_PATH.stat().st_mtime if CSS_PATH.exists() else 0.0
+st.markdown(_css_block(_css_mtime), unsafe_allow_html=True)
+
+# Initialize shared session state
+init_session_state()
+
+# ── Tab Navigation (Horizontal) ────────────────────────────────────
+
+# Get current tab from URL params or default to "coach"
+if "page" not in st.query_params:
+    st.query_params["page"] = "coach"
+current_tab = st.query_params.get("page", "coach")
 
 # Tab buttons (using Streamlit columns for click handling)
 col1, col2, col3, col4, col5 = st.columns([1, 1, 1, 1, 5])
@@ -117,30 +145,14 @@ document.addEventListener('DOMContentLoaded', function() {{
 
 # ── Render Selected Page ───────────────────────────────────────────
 
-if current_tab == "coach":
-    # Import and execute coach page
-    import importlib.util
-    spec = importlib.util.spec_from_file_location("coach_page", "pages/1_coach.py")
-    coach_module = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(coach_module)
-
-elif current_tab == "experts":
-    # Import and execute experts page
-    import importlib.util
-    spec = importlib.util.spec_from_file_location("experts_page", "pages/2_experts.py")
-    experts_module = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(experts_module)
-
-elif current_tab == "insights":
-    # Import and execute insights page
-    import importlib.util
-    spec = importlib.util.spec_from_file_location("insights_page", "pages/3_insights.py")
-    insights_module = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(insights_module)
-
-elif current_tab == "leaders":
-    # Import and execute leaders page
-    import importlib.util
-    spec = importlib.util.spec_from_file_location("leaders_page", "pages/4_leaders.py")
-    leaders_module = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(leaders_module)
+# Page modules are imported once (then reused from sys.modules) and their
+# main() called per rerun, instead of re-executing the page file each time
+PAGE_MODULES = {
+    "coach": "pages.1_coach",
+    "experts": "pages.2_experts",
+    "insights": "pages.3_insights",
+    "leaders": "pages.4_leaders",
+}
+
+if current_tab in PAGE_MODULES:
+    importlib.import_module(PAGE_MODULES[current_tab]).main()
@@ -24,10 +24,8 @@ if conn:
         cursor = conn.execute("SELECT COUNT(*) FROM insights")
         count = cursor.fetchone()[0]
         print(f"✅ Found {count} insights in database")
-        conn.close()
     except Exception as e:
         print(f"❌ Error querying database: {e}")
-        conn.close()
 else:
     print("❌ Connection failed - database not found")
 
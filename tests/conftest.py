@@ -1,7 +1,12 @@
 from __future__ import annotations
 
+from pathlib import Path
+
+import orjson
 import pytest
 
+REGISTRY_PATH = Path(__file__).parent.parent / "data" / "influencers.json"
+
 
 @pytest.fixture
 def tmp_data(tmp_path):
@@ -9,3 +14,13 @@ def tmp_data(tmp_path):
     d = tmp_path / "data"
     d.mkdir()
     return d
+
+
+@pytest.fixture(scope="session")
+def registry_data():
+    """Parsed data/influencers.json, loaded once for the whole test run.
+
+    Shared by every test module that reads the registry, so tests must not
+    mutate it.
+    """
+    return orjson.loads(REGISTRY_PATH.read_bytes())
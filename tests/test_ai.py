@@ -0,0 +1,76 @@
+"""Tests for request building in utils/ai.py."""
+from utils.ai import (
+    _build_persona_prompt,
+    _coaching_request,
+    _fallback_title,
+    _history_window,
+    _parse_stage_tips,
+)
+
+
+def _msg(role, chars):
+    return {"role": role, "content": "x" * chars, "sources": []}
+
+
+class TestHistoryWindow:
+    def test_keeps_short_history(self):
+        history = [_msg("user", 40), _msg("assistant", 400)] * 5
+        window = _history_window(history)
+        assert len(window) == 10
+        assert set(window[0]) == {"role", "content"}
+
+    def test_trims_oldest_to_budget(self):
+        history = [_msg("user", 400), _msg("assistant", 4000)] * 3
+        window = _history_window(history, budget=1500)
+        assert [m["role"] for m in window] == ["user", "assistant"]
+        assert window[-1]["content"] == history[-1]["content"]
+
+    def test_starts_on_user_message(self):
+        history = [_msg("user", 4000), _msg("assistant", 400), _msg("user", 40), _msg("assistant", 40)]
+        window = _history_window(history, budget=500)
+        assert [m["role"] for m in window] == ["user", "assistant"]
+
+    def test_empty(self):
+        assert _history_window([]) == []
+
+    def test_skips_trailing_user_turn(self):
+        history = [_msg("user", 40), _msg("assistant", 40), _msg("user", 8)]
+        window = _history_window(history)
+        assert [m["role"] for m in window] == ["user", "assistant"]
+        assert _history_window([_msg("user", 8)]) == []
+
+
+class TestCoachingRequest:
+    def test_insights_precede_question_without_cache_breakpoints(self):
+        request = _coaching_request("Prospect went silent", "CTX", [_msg("user", 10)], None)
+        assert isinstance(request["system"], str)
+
+        context_block, prompt_block = request["messages"][-1]["content"]
+        assert context_block["text"].endswith("CTX")
+        assert "Prospect went silent" in prompt_block["text"]
+        assert "cache_control" not in context_block
+        assert "cache_control" not in prompt_block
+
+    def test_unregistered_persona_builds_prompt(self):
+        persona = {"slug": "not-a-registered-expert", "name": "Pat Seller"}
+        request = _coaching_request("Pricing", "CTX", [], persona)
+        assert request["system"] == _build_persona_prompt(persona)
+
+
+class TestFallbackTitle:
+    def test_truncates_long_messages(self):
+        assert _fallback_title("How do I  handle price objections from CFOs") == "How do I handle price..."
+
+    def test_keeps_short_messages_whole(self):
+        assert _fallback_title("Discovery call tips") == "Discovery call tips"
+
+
+class TestParseStageTips:
+    def test_reads_tips_in_group_order(self):
+        text = '```json\n{"Close": " Ask for the signature ", "Discovery": "Ask why now"}\n```'
+        assert _parse_stage_tips(text, ["Discovery", "Close"]) == ["Ask why now", "Ask for the signature"]
+
+    def test_missing_group_or_bad_json(self):
+        assert _parse_stage_tips('{"Discovery": "Ask why now"}', ["Discovery", "Close"]) is None
+        assert _parse_stage_tips("Ask why now", ["Discovery"]) is None
+        assert _parse_stage_tips('{"Discovery": }', ["Discovery"]) is None
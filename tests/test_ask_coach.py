@@ -0,0 +1,138 @@
+"""Tests for ask_coach CLI record matching (no API calls)."""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "tools"))
+
+import ask_coach
+from ask_coach import (
+    STAGE_KEYWORDS,
+    _KW_TO_STAGE,
+    _STAGE_RE,
+    build_context,
+    fetch_records,
+    find_relevant_records,
+    flatten_record,
+    score_record,
+)
+from db import get_connection, init_db, upsert_insight
+
+
+def _stages(scenario):
+    return {_KW_TO_STAGE[kw] for kw in _STAGE_RE.findall(scenario)}
+
+
+class TestStageMatching:
+    def test_matches_substring_semantics(self):
+        scenarios = [
+            "how do i follow up after a demo with pricing questions",
+            "tasks for the ideal closing call",
+            "buttons and shows",
+            "nothing relevant",
+        ]
+        for scenario in scenarios:
+            expected = {
+                stage for stage, keywords in STAGE_KEYWORDS.items()
+                if any(kw in scenario for kw in keywords)
+            }
+            assert _stages(scenario) == expected
+
+    def test_overlapping_keywords_all_match(self):
+        # "but" and "timeline" share the "t"
+        assert _stages("butimeline") == {"objection", "qualification"}
+
+
+class TestScoreRecord:
+    def test_scores_flattened_record(self):
+        record = flatten_record({"fields": {
+            "Key Insight": "Anchor HIGH on Pricing",
+            "Primary Stage": "Negotiation",
+            "Relevance Score": 5,
+        }})
+        assert {"anchor", "high", "pricing", "negotiation"} <= record["search_tokens"]
+        assert score_record(record, ["pricing", "missing"], {"negotiation"}) == 2 + 3 + 1
+
+    def test_keywords_match_whole_words(self):
+        record = flatten_record({"fields": {"Key Insight": "Schedule the demos"}})
+        assert score_record(record, ["demos"], set()) == 2
+        assert score_record(record, ["demo"], set()) == 0
+
+    def test_repeated_keyword_counts_once(self):
+        records = [
+            flatten_record({"fields": {"Key Insight": "Pricing pages"}}),
+            flatten_record({"fields": {"Key Insight": "Anchor tips"}}),
+        ]
+        result = find_relevant_records(records, "pricing pricing anchor tips", top_n=1)
+        assert result == [records[1]]
+
+    def test_missing_fields(self):
+        record = flatten_record({})
+        assert score_record(record, ["pricing"], {"closing"}) == 0
+
+
+class TestFindRelevantRecords:
+    def test_top_n_best_first_ties_in_order(self):
+        records = [
+            flatten_record({"fields": {"Key Insight": text, "Relevance Score": rel}})
+            for text, rel in [("pricing", 0), ("nothing", 0), ("pricing", 5), ("pricing", 0)]
+        ]
+        result = find_relevant_records(records, "pricing", top_n=2)
+        assert result == [records[2], records[0]]
+
+    def test_no_matches_ranks_by_relevance(self):
+        records = [
+            flatten_record({"fields": {"Key Insight": name, "Relevance Score": score}})
+            for name, score in [("a", 3), ("b", 0), ("c", 9), ("d", 3)]
+        ]
+        relevant = find_relevant_records(records, "so, hi?", top_n=3)
+        assert [r["insight"] for r in relevant] == ["c", "a", "d"]
+
+
+class TestBuildContext:
+    def test_optional_sections(self):
+        full = flatten_record({"fields": {
+            "Influencer": "Chris Voss", "Primary Stage": "Negotiation",
+            "Key Insight": "Use silence", "Tactical Steps": "Pause", "Best Quote": "No deal",
+        }})
+        bare = flatten_record({"fields": {"Key Insight": "Listen"}})
+        assert build_context([full, bare]) == (
+            '**Chris Voss** (Negotiation):\nInsight: Use silence\nSteps: Pause\nKey quote: "No deal"'
+            "\n\n---\n\n"
+            "**Unknown** (General):\nInsight: Listen"
+        )
+
+
+class TestFetchDbRecords:
+    def _db(self, tmp_path, monkeypatch):
+        db_path = tmp_path / "test.db"
+        init_db(db_path)
+        conn = get_connection(db_path)
+        for i, (name, score) in enumerate([("Chris Voss", 7), ("Jane Doe", 9)]):
+            upsert_insight(conn, {
+                "id": f"rec{i}", "influencer_slug": name.lower().replace(" ", "-"),
+                "influencer_name": name, "source_type": "youtube",
+                "source_url": f"https://example.com/{i}", "date_collected": "2025-01-01",
+                "primary_stage": "Negotiation", "secondary_stages": ["Closing"],
+                "key_insight": f"Anchor pricing early ({name})",
+                "tactical_steps": ["Name a number", "Stay silent"],
+                "keywords": ["pricing"], "situation_examples": [],
+                "best_quote": "", "relevance_score": score,
+            })
+        conn.commit()
+        conn.close()
+        monkeypatch.setattr(ask_coach, "DB_PATH", db_path)
+
+    def test_reads_mirror_flattened(self, tmp_path, monkeypatch):
+        self._db(tmp_path, monkeypatch)
+        records = fetch_records()
+        assert [r["influencer"] for r in records] == ["Jane Doe", "Chris Voss"]
+        record = records[0]
+        assert record["secondary"] == "Closing"
+        assert record["steps"] == "Name a number, Stay silent"
+        assert record["situations"] == ""
+        assert {"anchor", "pricing", "negotiation"} <= record["search_tokens"]
+
+    def test_filters_by_influencer(self, tmp_path, monkeypatch):
+        self._db(tmp_path, monkeypatch)
+        records = fetch_records(influencer="Chris Voss")
+        assert [r["relevance"] for r in records] == [7]
@@ -4,56 +4,66 @@ Ensures names, slugs, and avatar files stay in sync
 across influencers.json, collect_linkedin.py,
 generate_avatars.py, and the assets/avatars/ directory.
 """
-import json
+import os
+import re
 from pathlib import Path
 
 import pytest
 
 PROJECT_ROOT = Path(__file__).parent.parent
-REGISTRY_PATH = PROJECT_ROOT / "data" / "influencers.json"
 AVATARS_DIR = PROJECT_ROOT / "assets" / "avatars"
 
+# lowercase-kebab-case: letters, digits, hyphens; no leading/trailing hyphen
+KEBAB_SLUG_RE = re.compile(r"[a-z0-9][a-z0-9\-]*[a-z0-9]")
+
 
 @pytest.fixture(scope="module")
-def registry_data():
-    with open(REGISTRY_PATH) as f:
-        return json.load(f)
+def influencer_rows(registry_data):
+    """(status, name, slug, linkedin_handle) per registry record, built once.
+
+    The set fixtures below are derived from these rows instead of each
+    walking the registry dicts again.
+    """
+    return [
+        (
+            expert.get("status"),
+            expert["name"],
+            expert["slug"],
+            expert.get("platforms", {}).get("linkedin", {}).get("handle"),
+        )
+        for expert in registry_data["influencers"]
+    ]
 
 
 @pytest.fixture(scope="module")
-def active_names(registry_data):
-    return {i["name"] for i in registry_data["influencers"] if i["status"] == "active"}
+def active_names(influencer_rows):
+    return {name for status, name, _, _ in influencer_rows if status == "active"}
 
 
 @pytest.fixture(scope="module")
-def active_slugs(registry_data):
-    return {i["slug"] for i in registry_data["influencers"] if i["status"] == "active"}
+def active_slugs(influencer_rows):
+    return {slug for status, _, slug, _ in influencer_rows if status == "active"}
 
 
 @pytest.fixture(scope="module")
-def linkedin_names(registry_data):
+def linkedin_names(influencer_rows):
     """Get influencer names that collect_linkedin.py would use.
 
     Mirrors _build_influencer_list() logic: active experts with a LinkedIn handle.
     """
-    names = set()
-    for expert in registry_data["influencers"]:
-        if expert.get("status") != "active":
-            continue
-        handle = expert.get("platforms", {}).get("linkedin", {}).get("handle")
-        if not handle:
-            continue
-        names.add(expert["name"])
-    return names
+    return {
+        name for status, name, _, handle in influencer_rows
+        if status == "active" and handle
+    }
 
 
 @pytest.fixture(scope="module")
-def avatar_script_slugs(registry_data):
+def avatar_script_slugs(influencer_rows):
     """Get slugs that generate_avatars.py would use.
 
     Mirrors _build_influencer_list() logic: all expert slugs + collective-wisdom.
     """
-    slugs = {expert["slug"] for expert in registry_data["influencers"]}
+    slugs = {slug for _, _, slug, _ in influencer_rows}
     slugs.add("collective-wisdom")
     return slugs
 
@@ -61,7 +71,8 @@ def avatar_script_slugs(registry_data):
 @pytest.fixture(scope="module")
 def avatar_files():
     """Get set of slug names from avatar PNG files on disk."""
-    return {p.stem for p in AVATARS_DIR.glob("*.png")}
+    with os.scandir(AVATARS_DIR) as entries:
+        return {entry.name[:-4] for entry in entries if entry.name.endswith(".png")}
 
 
 # ──────────────────────────────────────────────
@@ -78,22 +89,23 @@ class TestAvatarFiles:
         """The collective-wisdom avatar exists."""
         assert "collective-wisdom" in avatar_files
 
-    def test_no_orphan_avatars(self, registry_data, avatar_files):
+    def test_no_orphan_avatars(self, avatar_script_slugs, avatar_files):
         """All avatar PNGs correspond to a registry record or collective-wisdom."""
-        all_slugs = {i["slug"] for i in registry_data["influencers"]}
-        all_slugs.add("collective-wisdom")
-        orphans = avatar_files - all_slugs
+        orphans = avatar_files - avatar_script_slugs
         assert not orphans, f"Avatar PNGs with no registry record: {orphans}"
 
     def test_avatars_are_real_pngs(self, active_slugs):
         """Avatar files have non-zero size and valid PNG header."""
-        PNG_HEADER = b"\x89PNG"
+        PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
         for slug in active_slugs:
             path = AVATARS_DIR / f"{slug}.png"
             assert path.exists(), f"Missing: {path}"
-            content = path.read_bytes()
-            assert len(content) > 100, f"{slug}.png is suspiciously small ({len(content)} bytes)"
-            assert content[:4] == PNG_HEADER, f"{slug}.png is not a valid PNG file"
+            size = path.stat().st_size
+            assert size > 100, f"{slug}.png is suspiciously small ({size} bytes)"
+            # Only the signature is checked, so don't read the whole image
+            with open(path, "rb") as f:
+                header = f.read(len(PNG_SIGNATURE))
+            assert header == PNG_SIGNATURE, f"{slug}.png is not a valid PNG file"
 
 
 # ──────────────────────────────────────────────
@@ -144,20 +156,20 @@ class TestAvatarScriptConsistency:
 # ──────────────────────────────────────────────
 
 class TestSlugFormat:
-    def test_slugs_are_lowercase_kebab(self, registry_data):
+    def test_slugs_are_lowercase_kebab(self, influencer_rows):
         """All slugs use lowercase-kebab-case (letters, digits, hyphens only)."""
-        import re
-        pattern = re.compile(r"^[a-z0-9][a-z0-9\-]*[a-z0-9]$")
-        for inf in registry_data["influencers"]:
-            slug = inf["slug"]
-            assert pattern.match(slug), f"{inf['name']}: slug '{slug}' is not valid kebab-case"
+        invalid = [
+            f"{name}: '{slug}'" for _, name, slug, _ in influencer_rows
+            if not KEBAB_SLUG_RE.fullmatch(slug)
+        ]
+        assert not invalid, f"Slugs that are not valid kebab-case: {invalid}"
 
-    def test_slug_derived_from_name(self, registry_data):
+    def test_slug_derived_from_name(self, influencer_rows):
         """Slugs are reasonably derived from the name (no random strings)."""
-        for inf in registry_data["influencers"]:
-            name_lower = inf["name"].lower().replace(" ", "")
-            slug_compressed = inf["slug"].replace("-", "")
+        for _, name, slug, _ in influencer_rows:
+            name_lower = name.lower().replace(" ", "")
+            slug_compressed = slug.replace("-", "")
             # At least the first letter should match
-            if inf["name"] != "30MPC":
+            if name != "30MPC":
                 assert slug_compressed[0] == name_lower[0], \
-                    f"{inf['name']}: slug '{inf['slug']}' doesn't start with expected letter"
+                    f"{name}: slug '{slug}' doesn't start with expected letter"
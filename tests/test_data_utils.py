@@ -0,0 +1,164 @@
+"""Tests for the pure helpers in utils/data.py."""
+from utils.data import (
+    available_avatar_slugs,
+    get_avatar_base64,
+    filter_insights,
+    get_influencer_details,
+    get_influencer_name,
+    get_influencer_slugs_by_name,
+    get_stage_counts,
+    group_insights_by_stage,
+    load_filtered_insights,
+    load_insights,
+    load_stage_counts,
+    load_stage_groups,
+)
+
+
+def _insight(primary_stage: str) -> dict:
+    return {"primary_stage": primary_stage}
+
+
+# ──────────────────────────────────────────────
+# get_stage_counts
+# ──────────────────────────────────────────────
+
+class TestGetStageCounts:
+    def test_groups_and_mindset(self):
+        insights = [
+            _insight("Discovery"),
+            _insight("Needs Analysis"),
+            _insight("Closing"),
+            _insight("General Sales Mindset"),
+            _insight("General Sales Mindset"),
+        ]
+        counts = get_stage_counts(insights)
+        assert counts["All"] == 5
+        assert counts["Discovery & Analysis"] == 2
+        assert counts["Close & Grow"] == 1
+        assert counts["Planning & Research"] == 0
+        assert counts["Mindset"] == 2
+
+    def test_stage_match_is_case_insensitive(self):
+        counts = get_stage_counts([_insight("discovery"), _insight("CLOSING")])
+        assert counts["Discovery & Analysis"] == 1
+        assert counts["Close & Grow"] == 1
+
+    def test_empty(self):
+        counts = get_stage_counts([])
+        assert counts["All"] == 0
+        assert counts["Mindset"] == 0
+
+
+# ──────────────────────────────────────────────
+# filter_insights (stage group)
+# ──────────────────────────────────────────────
+
+class TestFilterInsightsByStageGroup:
+    def test_matches_primary_stage_in_group(self):
+        insights = [_insight("Discovery"), _insight("Closing")]
+        result = filter_insights(insights, stage_group="Discovery & Analysis")
+        assert result == [insights[0]]
+
+    def test_matches_secondary_stage_in_group(self):
+        insight = {"primary_stage": "Closing", "secondary_stages": ["needs analysis"]}
+        result = filter_insights([insight], stage_group="Discovery & Analysis")
+        assert result == [insight]
+
+    def test_mindset_group(self):
+        insights = [_insight("General Sales Mindset"), _insight("Discovery")]
+        result = filter_insights(insights, stage_group="General Sales Mindset")
+        assert result == [insights[0]]
+
+    def test_unknown_group_does_not_filter(self):
+        insights = [_insight("Discovery"), _insight("Closing")]
+        assert filter_insights(insights, stage_group="Nonexistent") == insights
+
+
+class TestGroupInsightsByStage:
+    def test_matches_filter_insights_for_every_group(self):
+        insights = [
+            _insight("Discovery"),
+            {"primary_stage": "Closing", "secondary_stages": ["needs analysis", "Discovery"]},
+            _insight("General Sales Mindset"),
+            _insight("Unknown Stage"),
+        ]
+        by_group = group_insights_by_stage(insights)
+        for group, members in by_group.items():
+            assert members == filter_insights(insights, stage_group=group)
+
+    def test_every_group_present(self):
+        by_group = group_insights_by_stage([])
+        assert by_group["Planning & Research"] == []
+        assert by_group["General Sales Mindset"] == []
+
+
+# ──────────────────────────────────────────────
+# Cached filter views
+# ──────────────────────────────────────────────
+
+class TestLoadFilteredInsights:
+    def test_matches_filter_insights(self):
+        expected = filter_insights(
+            load_insights(), expert_slug="chris-voss", stage_group="Close & Grow"
+        )
+        assert load_filtered_insights("chris-voss", "Close & Grow") == expected
+
+    def test_stage_only_and_unknown_stage(self):
+        insights = load_insights()
+        assert load_filtered_insights(stage_group="Discovery & Analysis") == filter_insights(
+            insights, stage_group="Discovery & Analysis"
+        )
+        assert load_filtered_insights(stage_group="Nonexistent") == insights
+
+    def test_reruns_share_one_list(self):
+        first = load_filtered_insights("chris-voss")
+        assert load_filtered_insights("chris-voss") is first
+
+    def test_stage_groups_match_grouping(self):
+        expected = group_insights_by_stage(load_filtered_insights("chris-voss"))
+        assert load_stage_groups("chris-voss") == expected
+
+    def test_stage_counts_cover_everything(self):
+        assert load_stage_counts()["All"] == len(load_filtered_insights())
+
+
+# ──────────────────────────────────────────────
+# Influencer lookups (slug index)
+# ──────────────────────────────────────────────
+
+class TestInfluencerLookup:
+    def test_known_slug(self):
+        assert get_influencer_name("chris-voss") == "Chris Voss"
+
+    def test_collective_wisdom(self):
+        assert get_influencer_name("collective-wisdom") == "Collective Wisdom"
+        assert "48" in get_influencer_details("collective-wisdom")["specialty"]
+
+    def test_name_to_slug(self):
+        assert get_influencer_slugs_by_name()["Chris Voss"] == "chris-voss"
+
+    def test_unknown_slug_falls_back(self):
+        assert get_influencer_name("nobody") == "nobody"
+        assert get_influencer_details("nobody")["slug"] == "nobody"
+
+
+# ──────────────────────────────────────────────
+# Avatars
+# ──────────────────────────────────────────────
+
+class TestAvatars:
+    def test_lists_shipped_avatars(self):
+        assert {"chris-voss", "collective-wisdom"} <= available_avatar_slugs()
+
+    def test_missing_avatar_is_empty(self):
+        assert get_avatar_base64("nobody") == ""
+        assert get_avatar_base64("chris-voss").startswith("iVBOR")
+
+    def test_missing_avatar_is_not_memoized(self, monkeypatch):
+        import utils.data
+
+        monkeypatch.setattr(utils.data, "available_avatar_slugs", frozenset)
+        assert get_avatar_base64("chris-voss") == ""
+        monkeypatch.undo()
+        assert get_avatar_base64("chris-voss").startswith("iVBOR")
@@ -10,43 +10,66 @@ sys.path.insert(0, str(Path(__file__).parent.parent / "tools"))
 
 from db import get_connection, init_db, upsert_insight, search_leaders
 
+# target_audience values as stored (JSON arrays)
+_VP_ONLY = json.dumps(["vp_sales"])
+_AE_ONLY = json.dumps(["ae"])
+_VP_CRO = json.dumps(["vp_sales", "cro"])
 
-@pytest.fixture
-def db(tmp_path):
-    """Create a fresh test database."""
-    db_path = tmp_path / "test.db"
+
+@pytest.fixture(scope="module")
+def db(tmp_path_factory):
+    """Create the test database once for this module."""
+    db_path = tmp_path_factory.mktemp("db") / "test.db"
     init_db(db_path)
     return db_path
 
 
-@pytest.fixture
-def conn(db):
-    """Get a connection to the test database."""
+@pytest.fixture(scope="module")
+def module_conn(db):
+    """One connection for the module; writes skip fsync (throwaway DB)."""
     c = get_connection(db)
+    c.execute("PRAGMA synchronous=OFF")
     yield c
     c.close()
 
 
+@pytest.fixture
+def conn(module_conn):
+    """The module connection, with every insight deleted after each test."""
+    yield module_conn
+    module_conn.rollback()
+    module_conn.execute("DELETE FROM insights")
+    module_conn.commit()
+
+
+# Fields shared by every test insight; _make_insight adds the id-specific ones
+_BASE_INSIGHT = {
+    "influencer_slug": "test-expert",
+    "influencer_name": "Test Expert",
+    "source_type": "linkedin",
+    "date_collected": "2026-01-01",
+    "primary_stage": "Discovery",
+    "secondary_stages": [],
+    "key_insight": "Ask open-ended questions to uncover needs",
+    "tactical_steps": ["Step 1", "Step 2"],
+    "keywords": ["discovery", "questions"],
+    "situation_examples": ["Meeting with CFO"],
+    "best_quote": "Great quote",
+    "relevance_score": 8,
+}
+
+
 def _make_insight(id, **overrides):
-    """Helper to build a minimal insight record."""
-    record = {
+    """Helper to build a minimal insight record.
+
+    List fields are shared with _BASE_INSIGHT, so tests must not mutate them.
+    """
+    return {
+        **_BASE_INSIGHT,
         "id": id,
-        "influencer_slug": "test-expert",
-        "influencer_name": "Test Expert",
-        "source_type": "linkedin",
         "source_url": f"https://example.com/{id}",
-        "date_collected": "2026-01-01",
-        "primary_stage": "Discovery",
-        "secondary_stages": [],
-        "key_insight": "Ask open-ended questions to uncover needs",
-        "tactical_steps": ["Step 1", "Step 2"],
-        "keywords": ["discovery", "questions"],
-        "situation_examples": ["Meeting with CFO"],
-        "best_quote": "Great quote",
-        "relevance_score": 8,
+        **overrides,
     }
-    record.update(overrides)
-    return record
 
 
 class TestAudienceColumns:
@@ -64,7 +87,7 @@ class TestAudienceColumns:
         upsert_insight(conn, record)
         conn.execute(
             "UPDATE insights SET target_audience = ?, audience_confidence = ? WHERE id = ?",
-            (json.dumps(["vp_sales", "cro"]), 0.9, "test-1"),
+            (_VP_CRO, 0.9, "test-1"),
         )
         conn.commit()
 
@@ -81,19 +104,18 @@ class TestSearchLeaders:
     def test_returns_only_leadership_insights(self, conn):
         """search_leaders only returns vp_sales/cro tagged insights."""
         vp = _make_insight("vp-1", key_insight="Build pipeline review cadence for your team")
-        upsert_insight(conn, vp)
-        conn.execute(
-            "UPDATE insights SET target_audience = ?, audience_confidence = ? WHERE id = ?",
-            (json.dumps(["vp_sales"]), 0.9, "vp-1"),
-        )
-
         ae = _make_insight("ae-1", key_insight="Ask discovery questions to understand pain")
-        upsert_insight(conn, ae)
-        conn.execute(
-            "UPDATE insights SET target_audience = ?, audience_confidence = ? WHERE id = ?",
-            (json.dumps(["ae"]), 0.85, "ae-1"),
-        )
-        conn.commit()
+        # One transaction for both inserts and their audience tags
+        with conn:
+            upsert_insight(conn, vp)
+            upsert_insight(conn, ae)
+            conn.executemany(
+                "UPDATE insights SET target_audience = ?, audience_confidence = ? WHERE id = ?",
+                [
+                    (_VP_ONLY, 0.9, "vp-1"),
+                    (_AE_ONLY, 0.85, "ae-1"),
+                ],
+            )
 
         results = search_leaders(conn, "pipeline review")
         ids = {r["id"] for r in results}
@@ -106,7 +128,7 @@ class TestSearchLeaders:
         upsert_insight(conn, low)
         conn.execute(
             "UPDATE insights SET target_audience = ?, audience_confidence = ? WHERE id = ?",
-            (json.dumps(["vp_sales"]), 0.3, "low-1"),
+            (_VP_ONLY, 0.3, "low-1"),
         )
         conn.commit()
 
@@ -16,7 +16,6 @@ import pytest
 # Paths
 PROJECT_ROOT = Path(__file__).parent.parent
 PERSONAS_PATH = PROJECT_ROOT / "data" / "personas.json"
-INFLUENCERS_PATH = PROJECT_ROOT / "data" / "influencers.json"
 
 # Import from tools (add to path so config.py resolves)
 import sys
@@ -70,11 +69,9 @@ def personas(personas_data):
     return personas_data["personas"]
 
 
-@pytest.fixture(scope="module")
-def influencers():
-    with open(INFLUENCERS_PATH) as f:
-        data = json.load(f)
-    return {i["slug"]: i for i in data["influencers"] if i["status"] == "active"}
+@pytest.fixture(scope="session")
+def influencers(registry_data):
+    return {i["slug"]: i for i in registry_data["influencers"] if i["status"] == "active"}
 
 
 @pytest.fixture
@@ -21,14 +21,8 @@ VALID_STATUSES = {"active", "company"}
 
 
 @pytest.fixture(scope="module")
-def registry():
-    with open(REGISTRY_PATH) as f:
-        return json.load(f)
-
-
-@pytest.fixture(scope="module")
-def influencers(registry):
-    return registry["influencers"]
+def influencers(registry_data):
+    return registry_data["influencers"]
 
 
 @pytest.fixture(scope="module")
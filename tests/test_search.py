@@ -0,0 +1,165 @@
+"""Tests for coaching-query scoring in utils/search.py."""
+from utils.search import (
+    CONTEXT_FIELD_WIDTH,
+    STAGE_KEYWORDS,
+    _WORD_RE,
+    _index_key,
+    build_context,
+    find_relevant_insights,
+    index_insights,
+    matched_stages,
+    score_insight,
+)
+
+
+def _insight(id, key_insight, primary_stage="General", relevance_score=0, **extra):
+    return {
+        "id": id,
+        "influencer_name": "Test Expert",
+        "key_insight": key_insight,
+        "primary_stage": primary_stage,
+        "relevance_score": relevance_score,
+        **extra,
+    }
+
+
+# ──────────────────────────────────────────────
+# find_relevant_insights
+# ──────────────────────────────────────────────
+
+class TestFindRelevantInsights:
+    def test_keyword_match_ranks_first(self):
+        insights = [
+            _insight("a", "Build rapport early"),
+            _insight("b", "Anchor high when pricing comes up"),
+        ]
+        result = find_relevant_insights(insights, "How should I handle pricing?")
+        assert result[0]["id"] == "b"
+
+    def test_stage_match_adds_weight(self):
+        insights = [
+            _insight("a", "Unrelated advice", primary_stage="Closing"),
+            _insight("b", "Unrelated advice", primary_stage="Discovery"),
+        ]
+        result = find_relevant_insights(insights, "Questions for my discovery call")
+        assert result[0]["id"] == "b"
+
+    def test_stage_keywords_match_as_substrings(self):
+        """Stage keywords match inside longer words, e.g. 'ask' in 'tasks'."""
+        insights = [_insight("a", "Nothing shared", primary_stage="Discovery")]
+        result = find_relevant_insights(insights, "tasks")
+        assert [i["id"] for i in result] == ["a"]
+
+    def test_matched_stages_agrees_with_substring_checks(self):
+        scenario = "closing the deal after a discovery call, then an upsell"
+        expected = {
+            stage for stage, keywords in STAGE_KEYWORDS.items()
+            if any(kw in scenario for kw in keywords)
+        }
+        assert expected and matched_stages(scenario) == expected
+
+    def test_short_words_are_ignored(self):
+        insights = [_insight("a", "the cfo and me")]
+        assert find_relevant_insights(insights, "the cfo and me") == []
+
+    def test_respects_top_n(self):
+        insights = [_insight(str(n), "pricing tips") for n in range(10)]
+        assert len(find_relevant_insights(insights, "pricing", top_n=3)) == 3
+
+    def test_sparse_expert_returns_up_to_eight(self):
+        insights = [_insight(str(n), "pricing tips") for n in range(10)]
+        result = find_relevant_insights(insights, "pricing", top_n=3, expert_slug="x")
+        assert len(result) == 8
+
+    def test_ranking_matches_score_insight(self):
+        insights = index_insights([
+            _insight("a", "Anchor high on pricing", primary_stage="Negotiation", relevance_score=3),
+            _insight("b", "Ask about budget early", primary_stage="Discovery", relevance_score=9),
+            _insight("c", "Pricing pages convert", primary_stage="Prospecting"),
+            _insight("d", "Unrelated", primary_stage="Closing", secondary_stages=["Negotiation"]),
+            _insight("e", "Nothing here"),
+        ])
+        scenario = "how do i negotiate pricing with budget holders"
+        keywords = _WORD_RE.findall(scenario)
+        stages = matched_stages(scenario)
+        expected = sorted(
+            (i for i in insights if score_insight(i, keywords, stages) > 0),
+            key=lambda i: score_insight(i, keywords, stages),
+            reverse=True,
+        )
+        assert find_relevant_insights(insights, scenario, top_n=10) == expected
+
+    def test_cached_results_are_callers_objects(self):
+        insights = [_insight("a", "Build rapport early"), _insight("b", "Pricing anchors")]
+        for _ in range(2):
+            [result] = find_relevant_insights(insights, "Pricing questions")
+            assert result is insights[1]
+
+    def test_appended_insights_are_searched(self):
+        insights = [_insight("a", "Build rapport early")]
+        assert find_relevant_insights(insights, "Pricing questions") == []
+        insights.append(_insight("b", "Pricing anchors"))
+        assert [i["id"] for i in find_relevant_insights(insights, "Pricing questions")] == ["b"]
+
+    def test_index_key_is_memoized_per_list(self):
+        insights = [_insight("a", "Build rapport early")]
+        assert _index_key(insights) == _index_key(list(insights))
+
+
+# ──────────────────────────────────────────────
+# index_insights / score_insight
+# ──────────────────────────────────────────────
+
+class TestIndexedScoring:
+    def test_index_adds_lowercased_tokens(self):
+        [insight] = index_insights([_insight("a", "Anchor HIGH on Pricing", keywords=["Budget"])])
+        assert {"anchor", "high", "pricing", "budget"} <= insight["search_tokens"]
+
+    def test_indexed_and_raw_scores_match(self):
+        raw = _insight("a", "Anchor high on pricing", primary_stage="Negotiation", relevance_score=8)
+        indexed = index_insights([dict(raw)])[0]
+        args = (["pricing", "anchor", "missing"], ["negotiation"])
+        assert score_insight(indexed, *args) == score_insight(raw, *args) == 2 * 2 + 3 + 8 / 5
+
+    def test_repeated_keyword_counts_once(self):
+        insight = _insight("a", "Pricing pages")
+        assert score_insight(insight, ["pricing", "pricing"], []) == 2
+
+    def test_keywords_match_whole_tokens(self):
+        insight = _insight("a", "Schedule the demos")
+        assert score_insight(insight, ["demos"], []) == 2
+        assert score_insight(insight, ["demo"], []) == 0
+
+
+# ──────────────────────────────────────────────
+# build_context
+# ──────────────────────────────────────────────
+
+class TestBuildContext:
+    def test_includes_optional_sections(self):
+        insight = _insight(
+            "a", "Ask why now",
+            primary_stage="Discovery",
+            tactical_steps=["Open", "Listen"],
+            best_quote="Seek to understand",
+        )
+        context = build_context([insight])
+        assert context.startswith("**Test Expert** (Discovery):\nInsight: Ask why now")
+        assert "\nSteps: Open, Listen" in context
+        assert '\nKey quote: "Seek to understand"' in context
+
+    def test_separates_insights(self):
+        context = build_context([_insight("a", "One"), _insight("b", "Two")])
+        assert context.count("\n\n---\n\n") == 1
+
+    def test_long_sections_are_shortened(self):
+        insight = _insight(
+            "a", "word " * 100,
+            tactical_steps=["step " * 100],
+            best_quote="quote " * 100,
+        )
+        steps, quote = build_context([insight]).split("\n")[2:4]
+        assert len(steps) <= len("Steps: ") + CONTEXT_FIELD_WIDTH
+        assert steps.endswith(" …")
+        assert quote.endswith(' …"')
+        assert build_context([insight]).count("word") == 100
@@ -0,0 +1,26 @@
+"""Tests for the stage filter option helpers in components/stage_pills.py."""
+from components.stage_pills import (
+    stage_group_options,
+    stage_option_to_value,
+    value_to_stage_option,
+)
+from utils.data import STAGE_GROUPS
+
+
+class TestStageGroupOptions:
+    def test_order_and_counts(self):
+        options = stage_group_options({"All": 10, "Close & Grow": 1, "Mindset": 2})
+        assert options[0] == "All stages (10)"
+        assert "Close & Grow (1)" in options
+        assert "Discovery & Analysis (0)" in options
+        assert options[-1] == "Mindset (2)"
+        assert len(options) == len(STAGE_GROUPS) + 2
+
+    def test_round_trip(self):
+        options = stage_group_options({})
+        for value in ["All", *STAGE_GROUPS, "General Sales Mindset"]:
+            assert stage_option_to_value(value_to_stage_option(value, options)) == value
+
+    def test_unknown_value_falls_back_to_all(self):
+        options = stage_group_options({})
+        assert value_to_stage_option("Nonexistent", options) == options[0]
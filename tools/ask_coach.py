@@ -3,8 +3,10 @@
 Ask the Coach - CLI Sales Wisdom Q&A
 
 Takes a natural language question about sales situations,
-searches the Airtable knowledge base, and uses Claude to
-synthesize personalized coaching advice.
+searches the knowledge base, and uses Claude to synthesize
+personalized coaching advice. Records are read from the local
+SQLite mirror (data/sales_coach.db, filled by migrate_to_sqlite.py)
+when it exists, and from Airtable otherwise.
 
 Usage:
     python tools/ask_coach.py
@@ -15,15 +17,18 @@ Usage:
 
 Requires:
     - ANTHROPIC_API_KEY
-    - AIRTABLE_API_KEY
-    - AIRTABLE_BASE_ID
-    - AIRTABLE_TABLE_NAME
+    - AIRTABLE_API_KEY, AIRTABLE_BASE_ID, AIRTABLE_TABLE_NAME
+      (only without the SQLite mirror)
 """
 import argparse
+import heapq
+import json
 import re
+import sqlite3
 import sys
-from pyairtable import Api
-import anthropic
+import textwrap
+from operator import itemgetter
+from typing import Iterator
 
 from config import (
     ANTHROPIC_API_KEY,
@@ -31,6 +36,7 @@ from config import (
     AIRTABLE_BASE_ID,
     AIRTABLE_TABLE_NAME,
     CLAUDE_MODEL,
+    DB_PATH,
 )
 from personas import (
     load_personas,
@@ -41,6 +47,24 @@ from personas import (
     GENERAL_COACH_SYSTEM_PROMPT,
 )
 
+# Airtable columns read below; fetched instead of every field
+AIRTABLE_FIELDS = [
+    "Influencer",
+    "Source URL",
+    "Primary Stage",
+    "Secondary Stages",
+    "Key Insight",
+    "Tactical Steps",
+    "Keywords",
+    "Situation Examples",
+    "Best Quote",
+    "Relevance Score",
+]
+
+# Longest steps/situations/quote text sent to Claude per record; the key
+# insight itself is always sent in full
+CONTEXT_FIELD_WIDTH = 240
+
 # Stage-related keywords for better matching
 STAGE_KEYWORDS = {
     "discovery": [
@@ -77,42 +101,154 @@ STAGE_KEYWORDS = {
 }
 
 
-def fetch_records():
-    """Fetch all records from Airtable."""
+# Compiled once at import: words of 4+ chars in the scenario, and every
+# stage keyword in one pass. The lookahead reports a match at each position
+# (so overlapping hits aren't swallowed), keeping the substring semantics of
+# `kw in scenario`; no keyword is a prefix of another stage's keyword.
+_WORD_RE = re.compile(r"\w{4,}")
+_KW_TO_STAGE = {
+    kw: stage for stage, keywords in STAGE_KEYWORDS.items() for kw in keywords
+}
+_STAGE_RE = re.compile("(?=(" + "|".join(map(re.escape, _KW_TO_STAGE)) + "))")
+
+
+def flatten_record(record: dict) -> dict:
+    """Pull the fields this tool reads out of an Airtable record, once.
+
+    Missing values become "" (0 for relevance), so scoring, context and
+    source printing read plain keys instead of re-chaining .get() calls.
+    The lowercased word tokens score_record matches against are built here
+    too, once per record instead of once per record per question.
+    """
+    fields = record.get("fields") or {}
+    flat = {
+        "influencer": fields.get("Influencer") or "",
+        "url": fields.get("Source URL") or "",
+        "stage": fields.get("Primary Stage") or "",
+        "secondary": fields.get("Secondary Stages") or "",
+        "insight": fields.get("Key Insight") or "",
+        "steps": fields.get("Tactical Steps") or "",
+        "keywords": fields.get("Keywords") or "",
+        "situations": fields.get("Situation Examples") or "",
+        "quote": fields.get("Best Quote") or "",
+        "relevance": fields.get("Relevance Score") or 0,
+    }
+    return _add_search_fields(flat)
+
+
+def flatten_row(row: sqlite3.Row) -> dict:
+    """Flatten a SQLite insights row to the same keys as flatten_record.
+
+    List columns are stored as JSON arrays; they are joined back into the
+    comma-separated text the Airtable fields hold.
+    """
+    flat = {
+        "influencer": row["influencer_name"] or "",
+        "url": row["source_url"] or "",
+        "stage": row["primary_stage"] or "",
+        "secondary": _joined_json(row["secondary_stages"]),
+        "insight": row["key_insight"] or "",
+        "steps": _joined_json(row["tactical_steps"]),
+        "keywords": _joined_json(row["keywords"]),
+        "situations": _joined_json(row["situation_examples"]),
+        "quote": row["best_quote"] or "",
+        "relevance": row["relevance_score"] or 0,
+    }
+    return _add_search_fields(flat)
+
+
+def _joined_json(value: str | None) -> str:
+    """A JSON array column as comma-separated text ("" when empty or invalid)."""
+    if not value:
+        return ""
+    try:
+        items = json.loads(value)
+    except json.JSONDecodeError:
+        return ""
+    return ", ".join(str(item) for item in items) if isinstance(items, list) else ""
+
+
+def _add_search_fields(flat: dict) -> dict:
+    """Add the lowercased stage strings and search tokens score_record reads."""
+    flat["stage_lower"] = flat["stage"].lower()
+    flat["secondary_lower"] = flat["secondary"].lower()
+    flat["search_tokens"] = frozenset(_WORD_RE.findall(" ".join([
+        flat["insight"], flat["stage"], flat["secondary"], flat["steps"],
+        flat["keywords"], flat["situations"], flat["quote"],
+    ]).lower()))
+    return flat
+
+
+# Columns of the insights table flatten_row reads
+_DB_COLUMNS = (
+    "influencer_name, source_url, primary_stage, secondary_stages, key_insight, "
+    "tactical_steps, keywords, situation_examples, best_quote, relevance_score"
+)
+
+
+def fetch_records(influencer: str | None = None):
+    """Fetch flattened records, from the SQLite mirror when it exists.
+
+    The mirror is a local read, so a question skips the Airtable round-trips;
+    without it, records come from Airtable (see fetch_airtable_records).
+    With influencer set, only that expert's records are read.
+    """
+    if DB_PATH.exists():
+        return fetch_db_records(influencer)
+    return fetch_airtable_records(influencer)
+
+
+def fetch_db_records(influencer: str | None = None):
+    """Read records from the SQLite mirror, flattened (see flatten_row)."""
+    query = f"SELECT {_DB_COLUMNS} FROM insights"
+    params: tuple = ()
+    if influencer:
+        query += " WHERE influencer_name = ?"
+        params = (influencer,)
+    query += " ORDER BY relevance_score DESC"
+
+    conn = sqlite3.connect(f"file:{DB_PATH}?mode=ro", uri=True)
+    conn.row_factory = sqlite3.Row
+    try:
+        return [flatten_row(row) for row in conn.execute(query, params)]
+    finally:
+        conn.close()
+
+
+def fetch_airtable_records(influencer: str | None = None):
+    """Fetch records from Airtable, flattened (see flatten_record).
+
+    With influencer set, Airtable filters on the Influencer field server-side,
+    so only that expert's records are downloaded.
+    """
     if not AIRTABLE_API_KEY or not AIRTABLE_BASE_ID:
         print("Error: Airtable credentials not configured")
         sys.exit(1)
 
+    # Imported here so --help and bad-argument exits skip the SDK import
+    from pyairtable import Api
+    from pyairtable.formulas import match
+
     base_id = AIRTABLE_BASE_ID.split("/")[0]
     api = Api(AIRTABLE_API_KEY)
     table = api.table(base_id, AIRTABLE_TABLE_NAME)
 
-    records = table.all()
-    return records
+    options = {"formula": match({"Influencer": influencer})} if influencer else {}
+    records = table.all(fields=AIRTABLE_FIELDS, page_size=100, **options)
+    return [flatten_record(record) for record in records]
 
 
 def score_record(
-    record: dict, user_keywords: list[str], matched_stages: list[str]
+    record: dict, user_keywords: frozenset[str], matched_stages: set[str]
 ) -> float:
-    """Score a record based on keyword and stage matches."""
-    fields = record.get("fields", {})
-
-    insight = (fields.get("Key Insight") or "").lower()
-    stage = (fields.get("Primary Stage") or "").lower()
-    secondary = (fields.get("Secondary Stages") or "").lower()
-    steps = (fields.get("Tactical Steps") or "").lower()
-    keywords = (fields.get("Keywords") or "").lower()
-    situations = (fields.get("Situation Examples") or "").lower()
-    quote = (fields.get("Best Quote") or "").lower()
-
-    combined = f"{insight} {stage} {secondary} {steps} {keywords} {situations} {quote}"
+    """Score a flattened record based on keyword and stage matches."""
+    stage = record["stage_lower"]
+    secondary = record["secondary_lower"]
+    tokens = record["search_tokens"]
 
-    score = 0.0
-
-    # Score based on keyword matches
-    for kw in user_keywords:
-        if kw in combined:
-            score += 2
+    # Score based on keyword matches: a set intersection, whole words only,
+    # each distinct keyword once (same as the app's scorer in utils/search.py)
+    score = 2.0 * len(tokens.intersection(user_keywords))
 
     # Bonus for stage matches
     for matched_stage in matched_stages:
@@ -120,8 +256,7 @@ def score_record(
             score += 3
 
     # Boost for higher original relevance scores
-    original_score = fields.get("Relevance Score") or 0
-    score += original_score / 5
+    score += record["relevance"] / 5
 
     return score
 
@@ -131,16 +266,16 @@ def find_relevant_records(
 ) -> list[dict]:
     """Find the most relevant records for a given scenario."""
     # Extract keywords from user's question
-    user_keywords = [
-        word.lower() for word in re.findall(r"\w+", scenario) if len(word) > 3
-    ]
+    scenario_lower = scenario.lower()
+    user_keywords = frozenset(_WORD_RE.findall(scenario_lower))
 
     # Find stage matches
-    matched_stages = []
-    scenario_lower = scenario.lower()
-    for stage, keywords in STAGE_KEYWORDS.items():
-        if any(kw in scenario_lower for kw in keywords):
-            matched_stages.append(stage)
+    matched_stages = {_KW_TO_STAGE[kw] for kw in _STAGE_RE.findall(scenario_lower)}
+
+    # Nothing to match: scores would be relevance / 5 alone
+    if not user_keywords and not matched_stages:
+        rated = (record for record in records if record["relevance"] > 0)
+        return heapq.nlargest(top_n, rated, key=itemgetter("relevance"))
 
     # Score all records
     scored = []
@@ -149,45 +284,50 @@ def find_relevant_records(
         if score > 0:
             scored.append((record, score))
 
-    # Sort by score and return top N
-    scored.sort(key=lambda x: x[1], reverse=True)
-    return [record for record, _ in scored[:top_n]]
+    # Top N by score without sorting the rest (ties keep input order)
+    return [record for record, _ in heapq.nlargest(top_n, scored, key=itemgetter(1))]
 
 
 def build_context(records: list[dict]) -> str:
     """Build context string from relevant records."""
-    parts = []
-    for record in records:
-        fields = record.get("fields", {})
-        influencer = fields.get("Influencer") or "Unknown"
-        stage = fields.get("Primary Stage") or "General"
-        insight = fields.get("Key Insight") or ""
-        steps = fields.get("Tactical Steps") or ""
-        situations = fields.get("Situation Examples") or ""
-        quote = fields.get("Best Quote") or ""
+    return "\n\n---\n\n".join(_context_entry(record) for record in records)
+
+
+def _context_entry(record: dict) -> str:
+    """One record's context block; optional sections are skipped when empty."""
+    influencer = record["influencer"] or "Unknown"
+    stage = record["stage"] or "General"
+
+    lines = [f"**{influencer}** ({stage}):", f"Insight: {record['insight']}"]
+    if record["steps"]:
+        lines.append(f"Steps: {_shortened(record['steps'])}")
+    if record["situations"]:
+        lines.append(f"When to use: {_shortened(record['situations'])}")
+    if record["quote"]:
+        lines.append(f'Key quote: "{_shortened(record["quote"])}"')
+    return "\n".join(lines)
 
-        part = f"**{influencer}** ({stage}):\nInsight: {insight}"
-        if steps:
-            part += f"\nSteps: {steps}"
-        if situations:
-            part += f"\nWhen to use: {situations}"
-        if quote:
-            part += f'\nKey quote: "{quote}"'
-        parts.append(part)
 
-    return "\n\n---\n\n".join(parts)
+def _shortened(text: str) -> str:
+    """Shorten long record text for the prompt (see CONTEXT_FIELD_WIDTH)."""
+    return textwrap.shorten(text, width=CONTEXT_FIELD_WIDTH, placeholder=" …")
 
 
-def get_coaching_advice(scenario: str, context: str, persona_slug: str = None) -> str:
-    """Call Claude API to synthesize coaching advice.
+def stream_coaching_advice(
+    scenario: str, context: str, persona_slug: str = None
+) -> Iterator[str]:
+    """Call Claude API to synthesize coaching advice, streamed as text chunks.
 
     When persona_slug is provided, responds as that expert using their
-    voice profile, frameworks, and signature phrases.
+    voice profile, frameworks, and signature phrases. Configuration errors
+    exit here, before any chunk is requested.
     """
     if not ANTHROPIC_API_KEY:
         print("Error: ANTHROPIC_API_KEY not configured")
         sys.exit(1)
 
+    import anthropic
+
     client = anthropic.Anthropic(api_key=ANTHROPIC_API_KEY)
 
     if persona_slug:
@@ -211,14 +351,16 @@ Based on these expert insights:
 
 Provide specific, actionable coaching advice."""
 
-    response = client.messages.create(
-        model=CLAUDE_MODEL,
-        max_tokens=1024,
-        system=system_prompt,
-        messages=[{"role": "user", "content": user_prompt}],
-    )
+    def chunks() -> Iterator[str]:
+        with client.messages.stream(
+            model=CLAUDE_MODEL,
+            max_tokens=1024,
+            system=system_prompt,
+            messages=[{"role": "user", "content": user_prompt}],
+        ) as stream:
+            yield from stream.text_stream
 
-    return response.content[0].text
+    return chunks()
 
 
 def print_sources(records: list[dict]):
@@ -227,11 +369,10 @@ def print_sources(records: list[dict]):
     print("SOURCES USED")
     print("=" * 50)
     for record in records:
-        fields = record.get("fields", {})
-        influencer = fields.get("Influencer") or "Unknown"
-        stage = fields.get("Primary Stage") or "General"
-        url = fields.get("Source URL") or ""
-        insight = fields.get("Key Insight") or ""
+        influencer = record["influencer"] or "Unknown"
+        stage = record["stage"] or "General"
+        url = record["url"]
+        insight = record["insight"]
 
         # Truncate insight
         short_insight = insight[:80] + "..." if len(insight) > 80 else insight
@@ -300,22 +441,16 @@ def main():
     print()
     print("Searching knowledge base...")
 
-    # Fetch and search records
-    records = fetch_records()
-    print(f"Found {len(records)} total records")
-
-    # Filter to persona's records if in persona mode
+    # Fetch records (in persona mode only that expert's are read)
+    records = fetch_records(influencer=persona_name)
     if persona_slug:
-        records = [
-            r for r in records
-            if r.get("fields", {}).get("Influencer") == persona_name
-        ]
-        print(f"Filtered to {len(records)} records from {persona_name}")
+        print(f"Found {len(records)} records from {persona_name}")
 
         # Adjust top_n based on data density
         persona = load_personas()[persona_slug]
         top_n = adjust_top_n(persona, len(records))
     else:
+        print(f"Found {len(records)} total records")
         top_n = 5
 
     relevant = find_relevant_records(records, scenario, top_n=top_n)
@@ -343,9 +478,9 @@ def main():
         prefix = build_persona_context_prefix(load_personas()[persona_slug])
         context = prefix + context
 
-    advice = get_coaching_advice(scenario, context, persona_slug=persona_slug)
+    advice = stream_coaching_advice(scenario, context, persona_slug=persona_slug)
 
-    # Display results
+    # Display results as Claude writes them
     print("=" * 50)
     if persona_name:
         print(f"COACHING FROM {persona_name.upper()}")
@@ -353,7 +488,9 @@ def main():
         print("COACHING ADVICE")
     print("=" * 50)
     print()
-    print(advice)
+    for chunk in advice:
+        print(chunk, end="", flush=True)
+    print()
 
     # Print sources
     print_sources(relevant)
@@ -1,80 +1,159 @@
-"""Claude API calls for coaching, persona mode, and title generation."""
+"""Claude API calls for coaching, persona mode, and title generation.
+
+The anthropic SDK is imported inside the functions that call Claude so
+page reruns that never reach the API don't pay for loading it.
+"""
 from __future__ import annotations
 
-from typing import Optional
+import json
+import os
+from typing import Iterator, Optional
 
-import anthropic
 import streamlit as st
 
 MODEL = "claude-sonnet-4-20250514"
 
+# Approximate token budget for prior chat messages sent to Claude
+HISTORY_TOKEN_BUDGET = 2000
+
 
 def get_anthropic_key() -> Optional[str]:
     """Get Anthropic API key from secrets or env."""
     try:
         return st.secrets["ANTHROPIC_API_KEY"]
     except Exception:
-        import os
-        from dotenv import load_dotenv
-        load_dotenv()
         return os.getenv("ANTHROPIC_API_KEY")
 
 
-def get_coaching_advice(
+@st.cache_resource
+def _anthropic_client(api_key: str):
+    """Shared Anthropic client per key, so its HTTP connection pool stays warm.
+
+    Per-call settings go through client.with_options(), which reuses the pool.
+    """
+    import anthropic
+    return anthropic.Anthropic(api_key=api_key)
+
+
+def stream_coaching_advice(
     scenario: str,
     context: str,
     chat_history: list[dict],
     persona: Optional[dict] = None,
-) -> str:
-    """Call Claude to synthesize coaching advice.
+) -> Iterator[str]:
+    """Stream coaching advice from Claude as text chunks.
+
+    Yields text as it is generated, so the UI can render it with
+    st.write_stream instead of waiting for the full completion.
 
     Args:
         scenario: The user's question/situation
         context: Built context string from relevant insights
-        chat_history: Prior messages for conversation continuity
+        chat_history: The conversation so far; a trailing user message (the
+            just-sent scenario) is skipped, see _history_window
         persona: Optional persona dict from personas.json for expert mode
     """
     api_key = get_anthropic_key()
     if not api_key:
-        return "API key not configured. Please add ANTHROPIC_API_KEY to secrets."
+        yield "API key not configured. Please add ANTHROPIC_API_KEY to secrets."
+        return
+
+    client = _anthropic_client(api_key)
 
-    client = anthropic.Anthropic(api_key=api_key)
+    with client.messages.stream(
+        **_coaching_request(scenario, context, chat_history, persona)
+    ) as stream:
+        yield from stream.text_stream
 
-    if persona:
-        system_prompt = _build_persona_prompt(persona)
-    else:
-        system_prompt = _build_general_prompt()
+
+def _coaching_request(
+    scenario: str,
+    context: str,
+    chat_history: list[dict],
+    persona: Optional[dict],
+) -> dict:
+    """Build the messages API kwargs for stream_coaching_advice."""
+    system_prompt = _system_prompt(persona)
 
     # Build messages with chat history for context
-    messages = []
-    history_to_include = chat_history[-6:] if len(chat_history) > 6 else chat_history
-    for msg in history_to_include:
-        messages.append({"role": msg["role"], "content": msg["content"]})
+    messages = _history_window(chat_history)
 
+    # Insights go ahead of the question in the final user turn. They are not
+    # a cache breakpoint: they follow the growing history and earlier turns
+    # are resent without them, so no later request repeats that prefix
     user_prompt = f"""A salesperson asks:
 
 "{scenario}"
 
-Based on these expert insights from top sales leaders:
-
-{context}
-
-Provide specific, actionable coaching advice. Reference which expert's wisdom you're drawing from when relevant."""
-
-    messages.append({"role": "user", "content": user_prompt})
-
-    response = client.messages.create(
-        model=MODEL,
-        max_tokens=1024,
-        system=system_prompt,
-        messages=messages,
-    )
-    return response.content[0].text
+Provide specific, actionable coaching advice based on the expert insights above. Reference which expert's wisdom you're drawing from when relevant."""
+
+    messages.append({
+        "role": "user",
+        "content": [
+            {
+                "type": "text",
+                "text": f"Expert insights from top sales leaders:\n\n{context}",
+            },
+            {"type": "text", "text": user_prompt},
+        ],
+    })
+
+    return {
+        "model": MODEL,
+        "max_tokens": 1024,
+        "system": system_prompt,
+        "messages": messages,
+    }
+
+
+def _history_window(chat_history: list[dict], budget: int = HISTORY_TOKEN_BUDGET) -> list[dict]:
+    """Most recent chat messages that fit in `budget` tokens, oldest first.
+
+    Tokens are approximated as len(content) // 4, so a few long answers
+    don't blow up the request and many short turns aren't cut off early.
+    The window always starts on a user message.
+
+    A trailing user message is the turn being answered, which the request
+    sends separately, so it is skipped. Callers can pass the full session
+    transcript: it is walked backwards from the end, never copied.
+    """
+    window = []
+    used = 0
+    turns = reversed(chat_history)
+    if chat_history and chat_history[-1]["role"] == "user":
+        next(turns)
+    for msg in turns:
+        used += len(msg["content"]) // 4 + 1
+        if used > budget:
+            break
+        window.append({"role": msg["role"], "content": msg["content"]})
+    window.reverse()
+
+    while window and window[0]["role"] != "user":
+        window.pop(0)
+    return window
+
+
+def _system_prompt(persona: Optional[dict]) -> str:
+    """System prompt for a coaching turn, prebuilt for known personas."""
+    if not persona:
+        return GENERAL_SYSTEM_PROMPT
+    prompt = _persona_prompts().get(persona.get("slug"))
+    return prompt if prompt is not None else _build_persona_prompt(persona)
+
+
+@st.cache_resource(ttl=600)
+def _persona_prompts() -> dict[str, str]:
+    """Persona-mode system prompts keyed by slug, built once per personas.json load.
+
+    Read-only: the dict is shared across sessions.
+    """
+    from utils.data import load_personas
+    return {slug: _build_persona_prompt(p) for slug, p in load_personas().items()}
 
 
-def _build_general_prompt() -> str:
-    """Standard coach system prompt."""
-    return """You are an expert sales coach who synthesizes wisdom from top sales leaders to provide actionable advice.
+# Standard coach system prompt
+GENERAL_SYSTEM_PROMPT = """You are an expert sales coach who synthesizes wisdom from top sales leaders to provide actionable advice.
 
 Your role is to:
 1. Understand the salesperson's specific situation
@@ -147,14 +226,30 @@ The insights below are from your own teachings and content:"""
 
 def generate_conversation_title(first_message: str) -> str:
     """Generate a short conversation title from the first user message."""
-    api_key = get_anthropic_key()
-    if not api_key:
-        words = first_message.split()[:5]
-        return " ".join(words) + "..."
+    if not get_anthropic_key():
+        return _fallback_title(first_message)
 
     try:
-        client = anthropic.Anthropic(api_key=api_key, timeout=15.0)
-        prompt = f"""Generate a 3-5 word title for this sales coaching conversation:
+        return _claude_title(first_message)
+    except Exception:
+        return _fallback_title(first_message)
+
+
+def _fallback_title(message: str) -> str:
+    """First five words of the message, with "..." if it was cut short."""
+    words = message.split()
+    suffix = "..." if len(words) > 5 else ""
+    return " ".join(words[:5]) + suffix
+
+
+@st.cache_data(ttl=86400, show_spinner=False)
+def _claude_title(first_message: str) -> str:
+    """Ask Claude for a title; cached per message across sessions.
+
+    Errors propagate so the caller's fallback title is never cached.
+    """
+    client = _anthropic_client(get_anthropic_key()).with_options(timeout=15.0)
+    prompt = f"""Generate a 3-5 word title for this sales coaching conversation:
 
 "{first_message}"
 
@@ -163,22 +258,31 @@ Return ONLY the title, no quotes or punctuation. Examples:
 - Handling Price Objections
 - Silent Prospect Follow-up"""
 
-        response = client.messages.create(
-            model=MODEL,
-            max_tokens=20,
-            messages=[{"role": "user", "content": prompt}],
-        )
-        return response.content[0].text.strip()
-    except Exception:
-        words = first_message.split()[:5]
-        return " ".join(words) + ("..." if len(first_message.split()) > 5 else "")
+    response = client.messages.create(
+        model=MODEL,
+        max_tokens=20,
+        messages=[{"role": "user", "content": prompt}],
+    )
+    return response.content[0].text.strip()
 
 
-def synthesize_stage_insight(group_name: str, insights: list[dict]) -> str:
-    """Synthesize a golden insight for a stage group (max 12 words)."""
-    if not insights:
-        return "No insights available yet."
+_STAGE_TIP_FALLBACK = "Focus on understanding before persuading."
 
+
+class _UncachedTips(Exception):
+    """Carries a batch of tips that includes fallbacks out of the cache.
+
+    st.cache_data doesn't store results of calls that raise, so a batch with
+    a timed-out or failed request is returned this way and retried later.
+    """
+
+    def __init__(self, tips: list[str]):
+        super().__init__("stage tip batch included fallbacks")
+        self.tips = tips
+
+
+def _stage_insight_block(group_name: str, insights: list[dict]) -> Optional[str]:
+    """Prompt section for one stage group, or None if there's nothing to summarize."""
     short_insights = []
     for insight in insights[:5]:
         key = insight.get("key_insight", "")
@@ -188,28 +292,97 @@ def synthesize_stage_insight(group_name: str, insights: list[dict]) -> str:
             short_insights.append(f"- {name}: {short}")
 
     if not short_insights:
-        return "No insights available yet."
+        return None
 
-    api_key = get_anthropic_key()
-    if not api_key:
-        return "Focus on understanding before persuading."
+    return f"""Insights about {group_name}:
+{chr(10).join(short_insights)}"""
+
+
+def _stage_tips_prompt(blocks: dict[str, str]) -> str:
+    """One prompt asking for a tip per stage group, answered as JSON."""
+    sections = "\n\n".join(blocks.values())
+    return f"""{sections}
+
+For each stage group above, write ONE actionable tip (max 12 words) as a direct instruction.
+Start with a verb. Do NOT start with "Top performers" or similar. Just the action.
+
+Return ONLY a JSON object mapping each group name to its tip, with these keys: {json.dumps(list(blocks))}"""
+
+
+def _parse_stage_tips(text: str, group_names: list[str]) -> Optional[list[str]]:
+    """Tips in group order from Claude's JSON reply, or None if any is missing."""
+    # Tolerate prose or code fences around the object
+    try:
+        data = json.loads(text[text.index("{"):text.rindex("}") + 1])
+    except ValueError:
+        return None
+    if not isinstance(data, dict):
+        return None
+    tips = [data.get(name) for name in group_names]
+    if not all(isinstance(tip, str) and tip.strip() for tip in tips):
+        return None
+    return [tip.strip() for tip in tips]
+
+
+def synthesize_stage_insights(groups: dict[str, list[dict]]) -> dict[str, str]:
+    """Synthesize golden insights for several stage groups in one Claude call.
+
+    Every group's top insights go into a single prompt that asks for a JSON
+    object of tips, so a page needs one round trip however many groups it
+    shows. Tips are cached across sessions by their prompt sections, which
+    are built from each group's top insights, so they refresh when the
+    underlying data does.
+    """
+    tips: dict[str, str] = {}
+    blocks: dict[str, str] = {}
+    for group_name, insights in groups.items():
+        block = _stage_insight_block(group_name, insights)
+        if block is None:
+            tips[group_name] = "No insights available yet."
+        else:
+            blocks[group_name] = block
+
+    if not blocks:
+        return tips
+
+    if not get_anthropic_key():
+        tips.update(dict.fromkeys(blocks, _STAGE_TIP_FALLBACK))
+        return tips
 
     try:
-        client = anthropic.Anthropic(api_key=api_key, timeout=30.0)
-        prompt = f"""Given these insights about {group_name}:
+        results = _claude_stage_tips(tuple(blocks.items()))
+    except _UncachedTips as partial:
+        results = partial.tips
+    tips.update(zip(blocks, results))
+    return tips
 
-{chr(10).join(short_insights)}
 
-Write ONE actionable tip (max 12 words) as a direct instruction.
-Start with a verb. Do NOT start with "Top performers" or similar. Just the action."""
+@st.cache_data(persist="disk", max_entries=256, show_spinner=False)
+def _claude_stage_tips(blocks: tuple[tuple[str, str], ...]) -> list[str]:
+    """Ask Claude for every group's tip at once; cached per (group, section) batch.
+
+    Persisted to disk so tips survive app restarts. No TTL (Streamlit
+    ignores it for persisted caches): the sections embed the insights they
+    summarize, so changed data is a new key rather than a stale entry.
+    """
+    import anthropic
 
+    group_names = [name for name, _ in blocks]
+    prompt = _stage_tips_prompt(dict(blocks))
+    client = _anthropic_client(get_anthropic_key()).with_options(timeout=30.0)
+
+    try:
         response = client.messages.create(
             model=MODEL,
-            max_tokens=50,
+            max_tokens=50 * len(group_names),
             messages=[{"role": "user", "content": prompt}],
         )
-        return response.content[0].text
     except anthropic.APITimeoutError:
-        return "Focus on understanding before persuading."
+        raise _UncachedTips([_STAGE_TIP_FALLBACK] * len(group_names))
     except Exception:
-        return "Insight loading failed."
+        raise _UncachedTips(["Insight loading failed."] * len(group_names))
+
+    tips = _parse_stage_tips(response.content[0].text, group_names)
+    if tips is None:
+        raise _UncachedTips(["Insight loading failed."] * len(group_names))
+    return tips
@@ -6,16 +6,23 @@ methodology data. All functions use Streamlit caching where appropriate.
 from __future__ import annotations
 
 import json
+import os
 import sqlite3
+from collections import Counter
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
+import orjson
 import streamlit as st
 
+from utils.search import index_insights
+
 PROJECT_ROOT = Path(__file__).parent.parent
 DB_PATH = PROJECT_ROOT / "data" / "sales_coach.db"
 PERSONAS_PATH = PROJECT_ROOT / "data" / "personas.json"
 REGISTRY_PATH = PROJECT_ROOT / "data" / "influencers.json"
+AVATAR_DIR = PROJECT_ROOT / "assets" / "avatars"
 
 # Deal stage groups for sidebar/filter navigation
 STAGE_GROUPS = {
@@ -45,6 +52,14 @@ STAGE_GROUPS = {
     ],
 }
 
+# Reverse lookup: lowercase stage name -> stage group (Mindset is its own group)
+_STAGE_TO_GROUP = {
+    stage.lower(): group
+    for group, stages in STAGE_GROUPS.items()
+    for stage in stages
+}
+_STAGE_TO_GROUP["general sales mindset"] = "General Sales Mindset"
+
 # Map stage names to their CSS color class
 STAGE_COLOR_MAP = {
     "Territory Planning": "planning",
@@ -87,11 +102,29 @@ def get_methodology_color(category: str) -> str:
 # ── SQLite connection ──────────────────────────────────
 
 def _get_db_connection() -> Optional[sqlite3.Connection]:
-    """Get a read-only SQLite connection if DB exists."""
+    """Get the shared read-only SQLite connection if DB exists.
+
+    The connection is opened once per process (see _db_connection), so
+    callers must not close it.
+    """
     if not DB_PATH.exists():
         return None
-    conn = sqlite3.connect(f"file:{DB_PATH}?mode=ro", uri=True)
+    return _db_connection(str(DB_PATH))
+
+
+@st.cache_resource
+def _db_connection(path: str) -> sqlite3.Connection:
+    """Open the read-only connection shared by every rerun and session.
+
+    The database is in WAL mode (set by tools/db.py, which the sync writes
+    through), so these reads don't block on a running sync. The pragmas
+    memory-map the file and keep hot pages and temp sorts in memory.
+    """
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
     conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA mmap_size=268435456")
+    conn.execute("PRAGMA cache_size=-65536")
+    conn.execute("PRAGMA temp_store=MEMORY")
     return conn
 
 
@@ -102,8 +135,7 @@ def load_influencers() -> list[dict]:
     """Load active influencers from the registry JSON."""
     try:
         if REGISTRY_PATH.exists():
-            with open(REGISTRY_PATH, "r") as f:
-                data = json.load(f)
+            data = orjson.loads(REGISTRY_PATH.read_bytes())
 
             influencers = []
             for inf in data.get("influencers", []):
@@ -129,35 +161,56 @@ def load_influencers() -> list[dict]:
     return []
 
 
+@st.cache_data(ttl=600)
+def load_influencer_count() -> int:
+    """Number of active influencers (for footers; skips copying the list)."""
+    return len(load_influencers())
+
+
+@st.cache_resource(ttl=600)
+def get_influencers_by_slug() -> dict[str, dict]:
+    """Index active influencers by slug for O(1) lookups.
+
+    Held as a shared resource (not copied per call), so treat the returned
+    dicts as read-only.
+    """
+    return {inf["slug"]: inf for inf in load_influencers()}
+
+
+@st.cache_resource(ttl=600)
+def get_influencer_slugs_by_name() -> dict[str, str]:
+    """Active influencer name -> slug, the reverse of get_influencers_by_slug."""
+    return {inf["name"]: inf["slug"] for inf in load_influencers()}
+
+
 def get_influencer_name(slug: str) -> str:
     """Get influencer name from slug."""
     if slug == "collective-wisdom":
         return "Collective Wisdom"
-    for inf in load_influencers():
-        if inf["slug"] == slug:
-            return inf["name"]
-    return slug
+    inf = get_influencers_by_slug().get(slug)
+    return inf["name"] if inf else slug
 
 
 def get_influencer_details(slug: str) -> dict:
     """Get full influencer details from slug."""
-    influencers = load_influencers()
+    by_slug = get_influencers_by_slug()
     if slug == "collective-wisdom":
         return {
             "name": "Collective Wisdom",
             "slug": "collective-wisdom",
-            "specialty": f"Combined insights from all {len(influencers)} experts",
+            "specialty": f"Combined insights from all {len(by_slug)} experts",
             "followers": None,
             "focus_areas": [],
         }
-    for inf in influencers:
-        if inf["slug"] == slug:
-            return inf
+    inf = by_slug.get(slug)
+    if inf:
+        return inf
     return {"name": slug, "slug": slug, "specialty": "", "followers": None, "focus_areas": []}
 
 
+@lru_cache(maxsize=256)
 def format_followers(count: Optional[int]) -> str:
-    """Format follower count for display."""
+    """Format follower count for display (memoized; counts repeat per expert)."""
     if count is None:
         return ""
     if count >= 1_000_000:
@@ -203,13 +256,13 @@ def get_confidence_label(confidence: str) -> str:
 
 # ── Insight loading (SQLite primary, Airtable fallback) ─
 
-@st.cache_data(ttl=300)
+@st.cache_data(ttl=300, show_spinner="Loading coaching insights...")
 def load_insights() -> list[dict]:
     """Load all insights. Tries SQLite first, falls back to Airtable."""
     conn = _get_db_connection()
     if conn:
-        return _load_insights_sqlite(conn)
-    return _load_insights_airtable()
+        return index_insights(_load_insights_sqlite(conn))
+    return index_insights(_load_insights_airtable())
 
 
 def _load_insights_sqlite(conn: sqlite3.Connection) -> list[dict]:
@@ -245,13 +298,28 @@ def _load_insights_sqlite(conn: sqlite3.Connection) -> list[dict]:
             insight["methodology_tags"] = [dict(t) for t in tags]
             insights.append(insight)
 
-        conn.close()
         return insights
     except Exception:
-        conn.close()
         return []
 
 
+# Only the Airtable columns _load_insights_airtable reads
+_AIRTABLE_FIELDS = [
+    "Influencer",
+    "Source Type",
+    "Source URL",
+    "Date Collected",
+    "Primary Stage",
+    "Secondary Stages",
+    "Key Insight",
+    "Tactical Steps",
+    "Keywords",
+    "Situation Examples",
+    "Best Quote",
+    "Relevance Score",
+]
+
+
 def _load_insights_airtable() -> list[dict]:
     """Fallback: load insights from Airtable, normalizing to SQLite schema."""
     try:
@@ -259,10 +327,10 @@ def _load_insights_airtable() -> list[dict]:
         if not all(secrets.values()):
             return []
 
-        from pyairtable import Api
-        api = Api(secrets["airtable_key"])
-        table = api.table(secrets["airtable_base"].split("/")[0], secrets["airtable_table"])
-        raw_records = table.all()
+        table = _airtable_table(
+            secrets["airtable_key"], secrets["airtable_base"], secrets["airtable_table"]
+        )
+        raw_records = table.all(fields=_AIRTABLE_FIELDS, page_size=100)
 
         insights = []
         for record in raw_records:
@@ -290,6 +358,13 @@ def _load_insights_airtable() -> list[dict]:
         return []
 
 
+@st.cache_resource
+def _airtable_table(api_key: str, base: str, table_name: str):
+    """Airtable table handle, kept per process so its HTTP session is reused."""
+    from pyairtable import Api
+    return Api(api_key).table(base.split("/")[0], table_name)
+
+
 def _get_airtable_secrets() -> dict:
     """Get Airtable secrets from Streamlit secrets or env."""
     try:
@@ -299,9 +374,6 @@ def _get_airtable_secrets() -> dict:
             "airtable_table": st.secrets.get("AIRTABLE_TABLE_NAME", "Sales Wisdom"),
         }
     except Exception:
-        import os
-        from dotenv import load_dotenv
-        load_dotenv()
         return {
             "airtable_key": os.getenv("AIRTABLE_API_KEY"),
             "airtable_base": os.getenv("AIRTABLE_BASE_ID"),
@@ -345,20 +417,8 @@ def filter_insights(
 
     # Filter by stage group
     if stage_group and stage_group != "All":
-        if stage_group == "General Sales Mindset":
-            stages = ["General Sales Mindset"]
-        else:
-            stages = STAGE_GROUPS.get(stage_group, [])
-        if stages:
-            stages_lower = [s.lower() for s in stages]
-            filtered = [
-                i for i in filtered
-                if i.get("primary_stage", "").lower() in stages_lower
-                or any(
-                    s.lower() in stages_lower
-                    for s in (i.get("secondary_stages") or [])
-                )
-            ]
+        if stage_group == "General Sales Mindset" or stage_group in STAGE_GROUPS:
+            filtered = [i for i in filtered if stage_group in _stage_groups_of(i)]
 
     # Filter by methodology
     if methodology_id:
@@ -388,6 +448,112 @@ def filter_insights(
     return filtered
 
 
+@st.cache_resource(ttl=300)
+def _insight_index() -> dict:
+    """All insights plus row-number indexes by expert and stage group.
+
+    Built once per load_insights snapshot and kept together with that
+    snapshot, so row numbers always point into the list they came from.
+    """
+    insights = load_insights()
+    by_slug: dict[str, list[int]] = {}
+    by_name: dict[str, list[int]] = {}
+    by_stage: dict[str, list[int]] = {
+        group: [] for group in [*STAGE_GROUPS, "General Sales Mindset"]
+    }
+    for row, insight in enumerate(insights):
+        by_slug.setdefault(insight.get("influencer_slug", ""), []).append(row)
+        by_name.setdefault(insight.get("influencer_name", "").lower(), []).append(row)
+        for group in _stage_groups_of(insight):
+            by_stage[group].append(row)
+    return {
+        "insights": insights,
+        "by_slug": by_slug,
+        "by_name": by_name,
+        "by_stage": by_stage,
+    }
+
+
+@st.cache_resource(ttl=300, max_entries=256)
+def load_filtered_insights(
+    expert_slug: Optional[str] = None,
+    stage_group: Optional[str] = None,
+    methodology_id: Optional[str] = None,
+) -> list[dict]:
+    """Insights matching the given filters, cached per filter combination.
+
+    Same results as filter_insights, but expert and stage filters intersect
+    precomputed row indexes instead of scanning every insight. Held in a
+    resource cache, so reruns get the same list back without copying;
+    callers must treat it as read-only.
+    """
+    index = _insight_index()
+    insights = index["insights"]
+
+    rows: Optional[set[int]] = None
+    if expert_slug and expert_slug != "collective-wisdom":
+        expert_name = get_influencer_name(expert_slug).lower()
+        rows = set(index["by_slug"].get(expert_slug, ()))
+        rows.update(index["by_name"].get(expert_name, ()))
+    if stage_group in index["by_stage"]:
+        stage_rows = set(index["by_stage"][stage_group])
+        rows = stage_rows if rows is None else rows & stage_rows
+
+    filtered = insights if rows is None else [insights[row] for row in sorted(rows)]
+    if methodology_id:
+        filtered = filter_insights(filtered, methodology_id=methodology_id)
+    return filtered
+
+
+@st.cache_resource(ttl=300, max_entries=64)
+def load_stage_groups(
+    expert_slug: Optional[str] = None,
+    methodology_id: Optional[str] = None,
+) -> dict[str, list[dict]]:
+    """Insights per stage group for an expert/methodology filter.
+
+    Same buckets as group_insights_by_stage over load_filtered_insights,
+    but each bucket comes from the precomputed stage index, so a rerun
+    doesn't rescan every insight. Shared and uncopied: read-only.
+    """
+    return {
+        group: load_filtered_insights(expert_slug, group, methodology_id)
+        for group in [*STAGE_GROUPS, "General Sales Mindset"]
+    }
+
+
+@st.cache_data(ttl=300)
+def load_stage_counts() -> dict[str, int]:
+    """Stage group counts across all insights (see get_stage_counts)."""
+    return get_stage_counts(load_filtered_insights())
+
+
+def _stage_groups_of(insight: dict) -> set[str]:
+    """Stage groups an insight belongs to via its primary or secondary stages."""
+    stages = [insight.get("primary_stage", ""), *(insight.get("secondary_stages") or [])]
+    return {
+        _STAGE_TO_GROUP[stage.lower()]
+        for stage in stages
+        if stage.lower() in _STAGE_TO_GROUP
+    }
+
+
+def group_insights_by_stage(insights: list[dict]) -> dict[str, list[dict]]:
+    """Bucket insights into every stage group they match, in one pass.
+
+    Same membership as filter_insights(stage_group=...), but for all groups
+    at once. Keys are the STAGE_GROUPS names plus "General Sales Mindset";
+    groups with no insights map to an empty list.
+    """
+    by_group: dict[str, list[dict]] = {
+        group: [] for group in [*STAGE_GROUPS, "General Sales Mindset"]
+    }
+    for insight in insights:
+        for group in _stage_groups_of(insight):
+            by_group[group].append(insight)
+    return by_group
+
+
 def get_insight_counts_by_expert(insights: list[dict]) -> dict[str, int]:
     """Count insights per expert slug."""
     counts: dict[str, int] = {}
@@ -398,20 +564,18 @@ def get_insight_counts_by_expert(insights: list[dict]) -> dict[str, int]:
 
 
 def get_stage_counts(insights: list[dict]) -> dict[str, int]:
-    """Count insights per stage group."""
-    counts = {"All": len(insights)}
-    for group_name, stages in STAGE_GROUPS.items():
-        stages_lower = [s.lower() for s in stages]
-        count = sum(
-            1 for i in insights
-            if i.get("primary_stage", "").lower() in stages_lower
-        )
-        counts[group_name] = count
-    mindset_count = sum(
-        1 for i in insights
-        if i.get("primary_stage", "").lower() == "general sales mindset"
+    """Count insights per stage group.
+
+    Each insight is bucketed with one reverse-map lookup on its primary
+    stage, so the cost doesn't grow with the number of groups.
+    """
+    by_group = Counter(
+        _STAGE_TO_GROUP.get(i.get("primary_stage", "").lower()) for i in insights
     )
-    counts["Mindset"] = mindset_count
+    counts = {"All": len(insights)}
+    for group_name in STAGE_GROUPS:
+        counts[group_name] = by_group[group_name]
+    counts["Mindset"] = by_group["General Sales Mindset"]
     return counts
 
 
@@ -454,10 +618,8 @@ def load_methodologies() -> list[dict]:
                     except json.JSONDecodeError:
                         c["keywords"] = []
             methodologies.append(m)
-        conn.close()
         return methodologies
     except Exception:
-        conn.close()
         return []
 
 
@@ -487,7 +649,6 @@ def search_insights_fts(query: str, limit: int = 20) -> list[dict]:
                LIMIT ?""",
             (query, limit),
         ).fetchall()
-        conn.close()
         results = []
         for row in rows:
             insight = dict(row)
@@ -501,9 +662,8 @@ def search_insights_fts(query: str, limit: int = 20) -> list[dict]:
                         insight[field] = []
             insight["methodology_tags"] = []
             results.append(insight)
-        return results
+        return index_insights(results)
     except Exception:
-        conn.close()
         return filter_insights(load_insights(), search_query=query)[:limit]
 
 
@@ -534,10 +694,8 @@ def load_leader_insights() -> list[dict]:
                     except json.JSONDecodeError:
                         insight[field] = []
             insights.append(insight)
-        conn.close()
-        return insights
+        return index_insights(insights)
     except Exception:
-        conn.close()
         return []
 
 
@@ -573,12 +731,40 @@ def get_leader_stats(insights: list[dict]) -> dict:
 
 # ── Avatar helpers ─────────────────────────────────────
 
-@st.cache_data(ttl=3600)
+@st.cache_data(ttl=600)
+def available_avatar_slugs() -> frozenset[str]:
+    """Slugs with a PNG in assets/avatars.
+
+    Refreshed every 10 minutes, so avatars added by the download tool show
+    up without restarting the app.
+    """
+    try:
+        return frozenset(p.stem for p in AVATAR_DIR.glob("*.png"))
+    except OSError:
+        return frozenset()
+
+
 def get_avatar_base64(slug: str) -> str:
-    """Get base64-encoded avatar for an expert. Cached aggressively."""
+    """Get base64-encoded avatar for an expert.
+
+    Slugs without an avatar are answered from available_avatar_slugs()
+    without touching the filesystem, and that answer isn't memoized, so an
+    avatar added later is picked up once the slug list refreshes.
+    """
+    if slug not in available_avatar_slugs():
+        return ""
+    return _avatar_base64(slug)
+
+
+@lru_cache(maxsize=256)
+def _avatar_base64(slug: str) -> str:
+    """Encode an existing avatar, memoized per process.
+
+    An avatar file doesn't change once written, so there's no TTL and no
+    per-call copy, and the first session warms it for every later visitor.
+    A plain lru_cache rather than st.cache_resource, since a page renders
+    dozens of avatars and Streamlit's per-call argument hashing cost more
+    than the lookup.
+    """
     import base64
-    avatar_path = PROJECT_ROOT / "assets" / "avatars" / f"{slug}.png"
-    if avatar_path.exists():
-        with open(avatar_path, "rb") as f:
-            return base64.b64encode(f.read()).decode()
-    return ""
+    return base64.b64encode((AVATAR_DIR / f"{slug}.png").read_bytes()).decode()
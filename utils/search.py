@@ -2,7 +2,16 @@
 from __future__ import annotations
 
 import re
-from typing import Optional
+import textwrap
+import threading
+from typing import Iterable, Optional
+
+import numpy as np
+import streamlit as st
+
+# Longest steps/situations/quote text sent to Claude per insight; the key
+# insight itself is always sent in full
+CONTEXT_FIELD_WIDTH = 240
 
 # Stage-related keywords for matching user queries to stages
 STAGE_KEYWORDS = {
@@ -17,8 +26,24 @@ STAGE_KEYWORDS = {
 }
 
 
-def score_insight(insight: dict, user_keywords: list[str], matched_stages: list[str]) -> float:
-    """Score an insight based on keyword and stage matches."""
+# Compiled once at import: words of 4+ chars in the scenario, and every
+# stage keyword in one pass. The lookahead reports a match at each position
+# (so overlapping hits aren't swallowed), keeping the substring semantics of
+# `kw in scenario`; no keyword is a prefix of another stage's keyword.
+_WORD_RE = re.compile(r"\w{4,}")
+_KW_TO_STAGE = {
+    kw: stage for stage, keywords in STAGE_KEYWORDS.items() for kw in keywords
+}
+_STAGE_RE = re.compile("(?=(" + "|".join(map(re.escape, _KW_TO_STAGE)) + "))")
+
+
+def matched_stages(scenario_lower: str) -> set[str]:
+    """STAGE_KEYWORDS stages whose keywords appear in a lowercased scenario."""
+    return {_KW_TO_STAGE[kw] for kw in _STAGE_RE.findall(scenario_lower)}
+
+
+def search_tokens(insight: dict) -> frozenset[str]:
+    """Lowercased 4+ char word tokens across an insight's searchable fields."""
     combined = " ".join([
         insight.get("key_insight", ""),
         insight.get("primary_stage", ""),
@@ -28,11 +53,27 @@ def score_insight(insight: dict, user_keywords: list[str], matched_stages: list[
         " ".join(insight.get("situation_examples") or []),
         insight.get("best_quote", ""),
     ]).lower()
+    return frozenset(_WORD_RE.findall(combined))
+
+
+def index_insights(insights: list[dict]) -> list[dict]:
+    """Attach precomputed search tokens to each insight, in place.
+
+    Called by the cached loaders so scoring a query is one set lookup per
+    keyword instead of re-joining and lowercasing every field.
+    """
+    for insight in insights:
+        insight["search_tokens"] = search_tokens(insight)
+    return insights
 
-    score = 0.0
-    for kw in user_keywords:
-        if kw in combined:
-            score += 2
+
+def score_insight(insight: dict, user_keywords: Iterable[str], matched_stages: list[str]) -> float:
+    """Score an insight based on keyword and stage matches."""
+    tokens = insight.get("search_tokens")
+    if tokens is None:
+        tokens = search_tokens(insight)
+
+    score = 2.0 * len(tokens.intersection(user_keywords))
 
     primary_stage = insight.get("primary_stage", "").lower()
     secondary = " ".join(insight.get("secondary_stages") or []).lower()
@@ -46,6 +87,84 @@ def score_insight(insight: dict, user_keywords: list[str], matched_stages: list[
     return score
 
 
+def _stage_text(insight: dict) -> str:
+    """Lowercased primary + secondary stages, newline-joined for substring checks."""
+    secondary = " ".join(insight.get("secondary_stages") or [])
+    return f"{insight.get('primary_stage', '')}\n{secondary}".lower()
+
+
+# Recent fingerprints by list identity. The cached loaders hand every rerun
+# the same read-only list, so its O(n) fingerprint is computed once. Entries
+# hold the list itself, so an id can't be reused while it is remembered.
+_INDEX_KEYS: dict[int, tuple[list[dict], int, int]] = {}
+_INDEX_KEYS_MAX = 16
+_INDEX_KEYS_LOCK = threading.Lock()
+
+
+def _index_key(insights: list[dict]) -> int:
+    """Fingerprint of everything the search index depends on.
+
+    Memoized per list object (see _INDEX_KEYS); lists passed to search
+    are treated as read-only, like the loaders' shared results.
+    """
+    entry = _INDEX_KEYS.get(id(insights))
+    if entry is not None and entry[0] is insights and entry[1] == len(insights):
+        return entry[2]
+
+    key = _fingerprint(insights)
+    with _INDEX_KEYS_LOCK:
+        if len(_INDEX_KEYS) >= _INDEX_KEYS_MAX:
+            del _INDEX_KEYS[next(iter(_INDEX_KEYS))]
+        _INDEX_KEYS[id(insights)] = (insights, len(insights), key)
+    return key
+
+
+def _fingerprint(insights: list[dict]) -> int:
+    """Hash of each insight's id, relevance, stages and search tokens."""
+    return hash(tuple(
+        (
+            insight.get("id"),
+            insight.get("relevance_score"),
+            _stage_text(insight),
+            insight.get("search_tokens") or search_tokens(insight),
+        )
+        for insight in insights
+    ))
+
+
+@st.cache_resource(ttl=300, max_entries=32)
+def _search_index(_insights: list[dict], key: int) -> dict:
+    """Build a vectorized search index over a list of insights.
+
+    Holds an inverted index (token -> array of row numbers), the relevance
+    boost per row, and a boolean row mask per STAGE_KEYWORDS stage, so a
+    query is scored with a handful of NumPy operations instead of a Python
+    loop over every insight. Cached per content fingerprint (`key`).
+    """
+    postings: dict[str, list[int]] = {}
+    stage_texts = []
+    relevance = np.empty(len(_insights), dtype=float)
+    for row, insight in enumerate(_insights):
+        tokens = insight.get("search_tokens")
+        if tokens is None:
+            tokens = search_tokens(insight)
+        for token in tokens:
+            postings.setdefault(token, []).append(row)
+        stage_texts.append(_stage_text(insight))
+        relevance[row] = insight.get("relevance_score") or 0
+
+    return {
+        "postings": {
+            token: np.array(rows, dtype=np.intp) for token, rows in postings.items()
+        },
+        "stage_masks": {
+            stage: np.array([stage in text for text in stage_texts], dtype=bool)
+            for stage in STAGE_KEYWORDS
+        },
+        "relevance_boost": relevance / 5,
+    }
+
+
 def find_relevant_insights(
     insights: list[dict],
     scenario: str,
@@ -54,67 +173,92 @@ def find_relevant_insights(
 ) -> list[dict]:
     """Find the most relevant insights for a given scenario.
 
+    Scores match score_insight: +2 per distinct keyword hit, +3 per matched stage,
+    plus relevance_score / 5. Ties keep their input order.
+
     If expert_slug is set, adjusts top_n based on data density:
     - <15 insights: return all with score > 0 (up to 8)
     - 15+: standard top_n with stage strength boost
     """
-    user_keywords = [word.lower() for word in re.findall(r"\w+", scenario) if len(word) > 3]
-
-    matched_stages = []
-    scenario_lower = scenario.lower()
-    for stage, keywords in STAGE_KEYWORDS.items():
-        if any(kw in scenario_lower for kw in keywords):
-            matched_stages.append(stage)
-
-    scored = []
-    for insight in insights:
-        score = score_insight(insight, user_keywords, matched_stages)
-        if score > 0:
-            scored.append((insight, score))
-
-    scored.sort(key=lambda x: x[1], reverse=True)
+    if not insights:
+        return []
 
     # Adjust top_n for data-sparse experts (from persona plan)
     if expert_slug:
         total = len(insights)
         if total < 15:
             top_n = min(total, 8)
-            return [i for i, s in scored if s > 0][:top_n]
 
-    return [insight for insight, _ in scored[:top_n]]
+    rows = _relevant_rows(insights, _index_key(insights), scenario.lower(), top_n)
+    return [insights[row] for row in rows]
+
+
+@st.cache_data(ttl=300, max_entries=256)
+def _relevant_rows(
+    _insights: list[dict], key: int, scenario_lower: str, top_n: int
+) -> list[int]:
+    """Row numbers of the top_n insights for a scenario, best first.
+
+    Cached on the insights fingerprint plus the query, so a rerun that asks
+    the same thing against the same data skips scoring. Only row numbers
+    are cached; the caller maps them back to its own insight dicts.
+    """
+    user_keywords = frozenset(_WORD_RE.findall(scenario_lower))
+    stages = matched_stages(scenario_lower)
+
+    index = _search_index(_insights, key)
+    scores = index["relevance_boost"].copy()
+    for kw in user_keywords:
+        rows = index["postings"].get(kw)
+        if rows is not None:
+            scores[rows] += 2
+    for stage in stages:
+        scores += 3 * index["stage_masks"][stage]
+
+    candidates = np.flatnonzero(scores > 0)
+    if 0 < top_n < len(candidates):
+        # Shortlist rows scoring at least the top_n-th best (ties included)
+        # in linear time, so the stable sort only orders the shortlist
+        kth = np.partition(scores[candidates], -top_n)[-top_n]
+        candidates = candidates[scores[candidates] >= kth]
+    ranked = candidates[np.argsort(-scores[candidates], kind="stable")]
+    return ranked[:top_n].tolist()
 
 
 def build_context(insights: list[dict]) -> str:
     """Build context string from relevant insights for the AI prompt."""
-    parts = []
-    for insight in insights:
-        name = insight.get("influencer_name", "Unknown")
-        stage = insight.get("primary_stage", "General")
-        key = insight.get("key_insight", "")
-        steps = insight.get("tactical_steps")
-        situations = insight.get("situation_examples")
-        quote = insight.get("best_quote", "")
-
-        part = f"**{name}** ({stage}):\nInsight: {key}"
-        if steps:
-            if isinstance(steps, list):
-                part += f"\nSteps: {', '.join(steps)}"
-            else:
-                part += f"\nSteps: {steps}"
-        if situations:
-            if isinstance(situations, list):
-                part += f"\nWhen to use: {', '.join(situations)}"
-            else:
-                part += f"\nWhen to use: {situations}"
-        if quote:
-            part += f'\nKey quote: "{quote}"'
-
-        # Add methodology context if tagged
-        tags = insight.get("methodology_tags") or []
-        if tags:
-            method_strs = [f"{t['methodology_name']} > {t['name']}" for t in tags[:3]]
-            part += f"\nMethodology: {', '.join(method_strs)}"
-
-        parts.append(part)
-
-    return "\n\n---\n\n".join(parts)
+    return "\n\n---\n\n".join(_context_entry(insight) for insight in insights)
+
+
+def _context_entry(insight: dict) -> str:
+    """One insight's context block; optional sections are skipped when empty."""
+    name = insight.get("influencer_name", "Unknown")
+    stage = insight.get("primary_stage", "General")
+    steps = insight.get("tactical_steps")
+    situations = insight.get("situation_examples")
+    quote = insight.get("best_quote", "")
+    # Add methodology context if tagged
+    tags = (insight.get("methodology_tags") or [])[:3]
+
+    lines = [f"**{name}** ({stage}):", f"Insight: {insight.get('key_insight', '')}"]
+    if steps:
+        lines.append(f"Steps: {_shortened(_joined(steps))}")
+    if situations:
+        lines.append(f"When to use: {_shortened(_joined(situations))}")
+    if quote:
+        lines.append(f'Key quote: "{_shortened(quote)}"')
+    if tags:
+        lines.append("Methodology: " + ", ".join(
+            f"{t['methodology_name']} > {t['name']}" for t in tags
+        ))
+    return "\n".join(lines)
+
+
+def _joined(value) -> str:
+    """A list field as comma-separated text; other values as-is."""
+    return ", ".join(value) if isinstance(value, list) else str(value)
+
+
+def _shortened(text: str) -> str:
+    """Text cut at a word boundary to CONTEXT_FIELD_WIDTH chars, marked with "…"."""
+    return textwrap.shorten(text, width=CONTEXT_FIELD_WIDTH, placeholder=" …")
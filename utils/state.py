@@ -22,9 +22,6 @@ def init_session_state() -> None:
 
         # Methodology filter
         "selected_methodology": None,
-
-        # Stage insights cache (synthesized golden insights per stage)
-        "stage_insights": {},
     }
 
     for key, default in defaults.items():
@@ -36,6 +33,7 @@ def reset_conversation() -> None:
     """Clear conversation and reset related state."""
     st.session_state.messages = []
     st.session_state.conversation_title = "New Conversation"
+    st.session_state.show_earlier_messages = False
 
 
 def switch_persona(slug: Optional[str]) -> None: